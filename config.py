@@ -3,15 +3,36 @@ Configuration settings for the T3C Python pipeline.
 """
 
 import os
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
+_DOTENV_LOADED = False
+
+# Snapshot of the process environment, taken once after .env has been loaded
+_ENV_SNAPSHOT: Dict[str, str] = {}
+
+
+def _ensure_dotenv_loaded():
+    """Load the .env file once and snapshot the resulting environment.
+    
+    Set T3C_SKIP_DOTENV=1 to skip reading .env when the environment is
+    already provided by the deployment.
+    """
+    global _DOTENV_LOADED, _ENV_SNAPSHOT
+    if _DOTENV_LOADED:
+        return
+    if os.environ.get("T3C_SKIP_DOTENV") != "1":
+        load_dotenv()
+    _ENV_SNAPSHOT = dict(os.environ)
+    _DOTENV_LOADED = True
+
+
 # Load environment variables from .env file
-load_dotenv()
+_ensure_dotenv_loaded()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProviderConfig:
     """Configuration for a specific LLM provider."""
     name: str
@@ -21,6 +42,17 @@ class ProviderConfig:
     cost_out_per_10k: float
     env_var_name: str
     api_key_prefix: str
+    supports_structured_outputs: bool = False
+    batch_discount: float = 1.0  # price multiplier for Batch API requests
+    
+    # Derived per-token prices, so cost calculations are a single multiplication
+    cost_in_per_token: float = field(init=False, repr=False)
+    cost_out_per_token: float = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        """Precompute the per-token prices (the dataclass is frozen)."""
+        object.__setattr__(self, "cost_in_per_token", self.cost_in_per_10k / 10000.0)
+        object.__setattr__(self, "cost_out_per_token", self.cost_out_per_10k / 10000.0)
 
 
 class Config:
@@ -35,7 +67,8 @@ class Config:
             cost_in_per_10k=0.1,   # $10 per 1M input tokens
             cost_out_per_10k=0.3,  # $30 per 1M output tokens
             env_var_name="OPENAI_API_KEY",
-            api_key_prefix="sk-"
+            api_key_prefix="sk-",
+            batch_discount=0.5  # Batch API is billed at 50% of standard rates
         ),
         'openrouter': ProviderConfig(
             name="OpenRouter (Gemini 2.0 Flash)",
@@ -44,9 +77,11 @@ class Config:
             cost_in_per_10k=0.0075,  # $0.075 per 1M input tokens
             cost_out_per_10k=0.03,   # $0.30 per 1M output tokens
             env_var_name="OPENROUTER_API_KEY",
-            api_key_prefix="sk-or-"
+            api_key_prefix="sk-or-",
+            supports_structured_outputs=True
         )
     }
+    _PROVIDER_KEYS = frozenset(PROVIDERS)
     
     # Default provider
     DEFAULT_PROVIDER = 'openrouter'
@@ -72,24 +107,81 @@ class Config:
     MODEL_TEMPERATURE = 0.0
     RESPONSE_FORMAT = {"type": "json_object"}
     
+    # Maximum number of LLM requests in flight at once
+    LLM_MAX_CONCURRENCY = 10
+    
+    # Step 5 asks for strict JSON-schema adherence where structured outputs are supported
+    STRUCTURED_OUTPUT_STRICT = True
+    
+    # Comments sent per Step 2 claims request (1 sends each comment on its own)
+    CLAIMS_BATCH_SIZE = 1
+    
+    # Batch API settings (Step 2 claims extraction)
+    BATCH_COMPLETION_WINDOW = "24h"
+    BATCH_POLL_INTERVAL = 30  # seconds between status checks
+    
+    # Step 4 can pack small subtopics into one dedup request up to this many
+    # estimated claim tokens (0 sends one request per subtopic)
+    DEDUP_BATCH_MAX_TOKENS = 0
+    CHARS_PER_TOKEN = 4  # rough ratio for prompt size estimates
+    
+    # Fraction of Step 2/4 rows rendered into W&B tables (1.0 logs every row)
+    LOG_SAMPLE_RATE = 1.0
+    
+    # Comments shown in the Step 1 W&B table cell
+    LOG_COMMENT_PREVIEW = 50
+    
+    # Connection pool for the shared OpenRouter client
+    HTTP_MAX_CONNECTIONS = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+    HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds
+    
+    # CSV streaming: PyArrow read block size, or rows per chunk for the pandas fallback
+    CSV_BLOCK_SIZE = 1 << 22  # 4 MiB
+    CSV_CHUNK_ROWS = 65536
+    
+    # Directory for the persistent Step 2 claims cache
+    CLAIMS_CACHE_DIR = ".cache/claims"
+    
+    # Validated API keys, keyed by provider
+    _api_key_cache: Dict[str, str] = {}
+    
     @classmethod
     def get_provider_config(cls, provider_key: str) -> ProviderConfig:
         """Get configuration for a specific provider."""
-        if provider_key not in cls.PROVIDERS:
-            raise ValueError(f"Unknown provider: {provider_key}. Available: {list(cls.PROVIDERS.keys())}")
-        return cls.PROVIDERS[provider_key]
+        try:
+            return cls.PROVIDERS[provider_key]
+        except KeyError:
+            raise ValueError(f"Unknown provider: {provider_key}. Available: {list(cls.PROVIDERS.keys())}") from None
     
     @classmethod
     def get_api_key(cls, provider_key: str) -> str:
         """Get API key for a specific provider."""
+        api_key = cls._api_key_cache.get(provider_key)
+        if api_key is not None:
+            return api_key
+        
         config = cls.get_provider_config(provider_key)
-        api_key = os.getenv(config.env_var_name)
+        api_key = _ENV_SNAPSHOT.get(config.env_var_name)
         if not api_key:
             raise ValueError(f"API key not found in environment variable: {config.env_var_name}")
         if not api_key.startswith(config.api_key_prefix):
             raise ValueError(f"Invalid API key format for {config.name}")
+        
+        cls._api_key_cache[provider_key] = api_key
         return api_key
     
+    @classmethod
+    def clear_api_key_cache(cls):
+        """Clear cached API keys and providers built with them, and re-read the process environment."""
+        global _ENV_SNAPSHOT
+        _ENV_SNAPSHOT = dict(os.environ)
+        cls._api_key_cache.clear()
+        
+        # Imported here to avoid a circular import (the providers import Config)
+        from providers.provider_factory import ProviderFactory
+        ProviderFactory.clear_instances()
+    
     @classmethod
     def validate_environment(cls, provider_key: str) -> bool:
         """Validate that all required environment variables are set."""
@@ -104,6 +196,8 @@ class Config:
 class RuntimeConfig:
     """Runtime configuration that can be modified during execution."""
     
+    _instance: Optional['RuntimeConfig'] = None
+    
     def __init__(self):
         self.provider_key = Config.DEFAULT_PROVIDER
         self.run_name = None
@@ -111,10 +205,36 @@ class RuntimeConfig:
         self.enable_wandb = True
         self.enable_weave = True
         self.debug_mode = False
+        self.use_batch_api = False
+        self.use_claims_cache = False
+        self.claims_batch_size = Config.CLAIMS_BATCH_SIZE
+        self.dedup_batch_max_tokens = Config.DEDUP_BATCH_MAX_TOKENS
+        self.log_sample_rate = Config.LOG_SAMPLE_RATE
+    
+    @classmethod
+    def instance(cls) -> 'RuntimeConfig':
+        """Get the shared runtime configuration, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def configure(self, args) -> 'RuntimeConfig':
+        """Update settings from parsed command-line arguments."""
+        self.set_provider(args.provider)
+        self.exp_group = args.exp_group
+        self.enable_wandb = not args.no_wandb
+        self.enable_weave = not args.no_weave
+        self.debug_mode = args.debug
+        self.use_batch_api = args.batch_api
+        self.use_claims_cache = args.claims_cache
+        self.claims_batch_size = max(1, args.claims_batch_size)
+        self.dedup_batch_max_tokens = max(0, args.dedup_batch_max_tokens)
+        self.log_sample_rate = min(1.0, max(0.0, args.log_sample_rate))
+        return self
         
     def set_provider(self, provider_key: str):
         """Set the provider to use."""
-        if provider_key not in Config.PROVIDERS:
+        if provider_key not in Config._PROVIDER_KEYS:
             raise ValueError(f"Unknown provider: {provider_key}")
         self.provider_key = provider_key
         
@@ -15,12 +15,21 @@ from typing import List, Optional
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config, RuntimeConfig
-from providers.provider_factory import ProviderFactory
 from utils.data_loader import DataLoader
 from utils.cost_estimator import CostEstimator
-from utils.logging_utils import Logger
 from utils.formatting import Formatter
-from pipeline.pipeline_orchestrator import PipelineOrchestrator
+from utils.json_utils import JSONUtils
+
+
+_RESULTS_DIR_READY = False
+
+
+def ensure_results_dir():
+    """Create the results directory once per process."""
+    global _RESULTS_DIR_READY
+    if not _RESULTS_DIR_READY:
+        os.makedirs("results", exist_ok=True)
+        _RESULTS_DIR_READY = True
 
 
 def setup_argument_parser() -> argparse.ArgumentParser:
@@ -102,6 +111,36 @@ Examples:
         action="store_true",
         help="Disable Weave logging"
     )
+    parser.add_argument(
+        "--log-sample-rate",
+        type=float,
+        default=Config.LOG_SAMPLE_RATE,
+        help=f"Fraction of per-comment claims and dedup rows to log to W&B tables (default: {Config.LOG_SAMPLE_RATE})"
+    )
+    
+    # Execution options
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Submit Step 2 claims extraction through the provider's Batch API when supported"
+    )
+    parser.add_argument(
+        "--claims-batch-size",
+        type=int,
+        default=Config.CLAIMS_BATCH_SIZE,
+        help=f"Comments to extract claims from per Step 2 request (default: {Config.CLAIMS_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--dedup-batch-max-tokens",
+        type=int,
+        default=Config.DEDUP_BATCH_MAX_TOKENS,
+        help=f"Pack small subtopics into one Step 4 request up to this many estimated claim tokens; 0 sends one request per subtopic (default: {Config.DEDUP_BATCH_MAX_TOKENS})"
+    )
+    parser.add_argument(
+        "--claims-cache",
+        action="store_true",
+        help=f"Reuse claims extracted in previous runs with the same taxonomy, model, prompts and batch size (stored in {Config.CLAIMS_CACHE_DIR})"
+    )
     
     # Utility options
     parser.add_argument(
@@ -159,7 +198,7 @@ def compare_costs(comments: List[str]):
     """Compare costs across all providers."""
     print("💰 Comparing costs across providers...\n")
     
-    cost_estimator = CostEstimator(Config.get_provider_config("openai"))  # Use any provider for comparison
+    cost_estimator = CostEstimator.for_provider("openai")  # Use any provider for comparison
     comparison = cost_estimator.compare_providers(comments)
     
     print(Formatter.format_provider_comparison(comparison))
@@ -185,11 +224,19 @@ def validate_environment():
 
 def main():
     """Main entry point."""
+    # Fast path: environment validation needs neither the parser nor a data source
+    # (help requests still go through argparse)
+    argv = sys.argv[1:]
+    if "--validate-env" in argv and "-h" not in argv and "--help" not in argv:
+        validate_environment()
+        return
+    
     parser = setup_argument_parser()
     args = parser.parse_args()
+    logger = None
     
     try:
-        # Handle utility commands
+        # Handle utility commands (also catches abbreviations such as --validate)
         if args.validate_env:
             validate_environment()
             return
@@ -207,17 +254,17 @@ def main():
             print("Please set the required API key environment variable")
             return
         
+        # Deferred so the utility commands above don't pay for these imports
+        from providers.provider_factory import ProviderFactory
+        from utils.logging_utils import Logger
+        from pipeline.pipeline_orchestrator import PipelineOrchestrator
+        
         # Create provider
         print(f"🔧 Initializing {args.provider} provider...")
         provider = ProviderFactory.create_provider(args.provider)
         
         # Set up runtime configuration
-        runtime_config = RuntimeConfig()
-        runtime_config.set_provider(args.provider)
-        runtime_config.exp_group = args.exp_group
-        runtime_config.enable_wandb = not args.no_wandb
-        runtime_config.enable_weave = not args.no_weave
-        runtime_config.debug_mode = args.debug
+        runtime_config = RuntimeConfig.instance().configure(args)
         
         # Create logger
         logger = Logger(runtime_config)
@@ -232,16 +279,13 @@ def main():
         
         # Save structured JSON output to results folder
         if report.structured_json:
-            import json
-            import os
-            
             # Ensure results directory exists
-            os.makedirs("results", exist_ok=True)
+            ensure_results_dir()
             
             # Save structured JSON
             json_filename = f"results/{run_name}_structured_output.json"
-            with open(json_filename, 'w') as f:
-                json.dump(report.structured_json, f, indent=2)
+            with open(json_filename, 'wb') as f:
+                f.write(JSONUtils.dumps_bytes(report.structured_json, indent=True))
             
             print(f"📄 Structured JSON saved to: {json_filename}")
         
@@ -260,6 +304,10 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Flush queued W&B payloads on error paths too (no-op after success)
+        if logger is not None:
+            logger.finish()
 
 
 if __name__ == "__main__":
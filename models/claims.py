@@ -2,12 +2,22 @@
 Data models for claims structures.
 """
 
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from openai.types import CompletionUsage
 
+from utils.json_utils import JSONUtils
 
-@dataclass
+# Interned field names used by the LLM claims JSON
+_K_CLAIM = sys.intern("claim")
+_K_QUOTE = sys.intern("quote")
+_K_TOPIC = sys.intern("topicName")
+_K_SUBTOPIC = sys.intern("subtopicName")
+_K_CLAIMS = sys.intern("claims")
+
+
+@dataclass(frozen=True, slots=True)
 class Claim:
     """Represents a single claim extracted from a comment."""
     claim: str
@@ -18,39 +28,38 @@ class Claim:
     def to_dict(self) -> Dict[str, str]:
         """Convert to dictionary format."""
         return {
-            "claim": self.claim,
-            "quote": self.quote,
-            "topicName": self.topic_name,
-            "subtopicName": self.subtopic_name
+            _K_CLAIM: self.claim,
+            _K_QUOTE: self.quote,
+            _K_TOPIC: self.topic_name,
+            _K_SUBTOPIC: self.subtopic_name
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> 'Claim':
         """Create from dictionary."""
-        return cls(
-            claim=data["claim"],
-            quote=data["quote"],
-            topic_name=data["topicName"],
-            subtopic_name=data["subtopicName"]
-        )
+        return cls(data[_K_CLAIM], data[_K_QUOTE], data[_K_TOPIC], data[_K_SUBTOPIC])
 
 
 @dataclass
 class ClaimsExtraction:
     """Represents claims extracted from a single comment."""
-    claims: List[Claim]
+    claims: Tuple[Claim, ...]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
         return {
-            "claims": [claim.to_dict() for claim in self.claims]
+            _K_CLAIMS: [claim.to_dict() for claim in self.claims]
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ClaimsExtraction':
         """Create from dictionary."""
+        claim_cls = Claim
         return cls(
-            claims=[Claim.from_dict(claim) for claim in data.get("claims", [])]
+            claims=tuple([
+                claim_cls(c[_K_CLAIM], c[_K_QUOTE], c[_K_TOPIC], c[_K_SUBTOPIC])
+                for c in data.get(_K_CLAIMS, ())
+            ])
         )
     
     def get_num_claims(self) -> int:
@@ -63,14 +72,47 @@ class ClaimsResponse:
     """Response from the claims extraction step."""
     claims_extraction: ClaimsExtraction
     usage: CompletionUsage
+    batch_priced: bool = False  # served by a Batch API job (discounted pricing)
     
     @classmethod
-    def from_llm_response(cls, response_dict: Dict[str, Any], usage: CompletionUsage) -> 'ClaimsResponse':
+    def from_llm_response(cls, response_dict: Dict[str, Any], usage: CompletionUsage,
+                          batch_priced: bool = False) -> 'ClaimsResponse':
         """Create from LLM response."""
         return cls(
             claims_extraction=ClaimsExtraction.from_dict(response_dict),
-            usage=usage
+            usage=usage,
+            batch_priced=batch_priced
         )
+    
+    @classmethod
+    def from_llm_content(cls, content: str, usage: CompletionUsage,
+                         batch_priced: bool = False) -> 'ClaimsResponse':
+        """Create directly from the raw JSON content of an LLM response."""
+        return cls.from_llm_response(JSONUtils.loads(content), usage, batch_priced)
+
+
+@dataclass
+class MultiClaimsResponse:
+    """Response from extracting claims for several comments in one request."""
+    claims_extractions: List[Optional[ClaimsExtraction]]
+    usage: CompletionUsage
+    
+    @classmethod
+    def from_llm_response(cls, response_dict: Dict[str, Any], usage: CompletionUsage,
+                          num_comments: int) -> 'MultiClaimsResponse':
+        """Create from LLM response, with None for comments missing from it."""
+        extractions: List[Optional[ClaimsExtraction]] = [None] * num_comments
+        for result in response_dict.get("results", ()):
+            idx = result.get("commentIdx") if isinstance(result, dict) else None
+            if isinstance(idx, int) and 0 <= idx < num_comments:
+                extractions[idx] = ClaimsExtraction.from_dict(result)
+        return cls(claims_extractions=extractions, usage=usage)
+    
+    @classmethod
+    def from_llm_content(cls, content: str, usage: CompletionUsage,
+                         num_comments: int) -> 'MultiClaimsResponse':
+        """Create directly from the raw JSON content of an LLM response."""
+        return cls.from_llm_response(JSONUtils.loads(content), usage, num_comments)
 
 
 @dataclass
@@ -93,10 +135,13 @@ class TopicClaims:
     subtopics: Dict[str, SubtopicClaims]
     total_count: int
     
-    def __init__(self, topic_name: str, subtopics: Dict[str, SubtopicClaims]):
+    def __init__(self, topic_name: str, subtopics: Dict[str, SubtopicClaims],
+                 total_count: Optional[int] = None):
         self.topic_name = topic_name
         self.subtopics = subtopics
-        self.total_count = sum(subtopic.total_count for subtopic in subtopics.values())
+        if total_count is None:
+            total_count = sum(subtopic.total_count for subtopic in subtopics.values())
+        self.total_count = total_count
 
 
 @dataclass
@@ -106,11 +151,27 @@ class SortedTaxonomy:
     
     def get_total_topics(self) -> int:
         """Get total number of topics."""
-        return sum(len(topic.subtopics) for topic in self.topics.values())
+        return sum(map(len, (topic.subtopics for topic in self.topics.values())))
     
     def get_total_claims(self) -> int:
         """Get total number of claims."""
         return sum(topic.total_count for topic in self.topics.values())
+    
+    def to_legacy_dict(self) -> Dict[str, Any]:
+        """Convert to the legacy nested {topic: {total, subtopics}} format."""
+        return {
+            topic_name: {
+                "total": topic_claims.total_count,
+                "subtopics": {
+                    subtopic_name: {
+                        "total": subtopic_claims.total_count,
+                        "claims": subtopic_claims.claims
+                    }
+                    for subtopic_name, subtopic_claims in topic_claims.subtopics.items()
+                }
+            }
+            for topic_name, topic_claims in self.topics.items()
+        }
 
 
 @dataclass
@@ -140,7 +201,7 @@ class DeduplicationResult:
     
     def has_duplicates(self) -> bool:
         """Check if there are any duplicates."""
-        return any(len(duplicates) > 0 for duplicates in self.nesting.values())
+        return any(self.nesting.values())
 
 
 @dataclass
@@ -155,4 +216,32 @@ class DeduplicationResponse:
         return cls(
             deduplication_result=DeduplicationResult.from_dict(response_dict),
             usage=usage
-        ) 
\ No newline at end of file
+        )
+    
+    @classmethod
+    def from_llm_content(cls, content: str, usage: CompletionUsage) -> 'DeduplicationResponse':
+        """Create directly from the raw JSON content of an LLM response."""
+        return cls.from_llm_response(JSONUtils.loads(content), usage) 
+
+
+@dataclass
+class DeduplicationBatchResponse:
+    """Response from deduplicating several subtopics in one request."""
+    deduplication_results: List[Optional[DeduplicationResult]]
+    usage: CompletionUsage
+    
+    @classmethod
+    def from_llm_response(cls, response_dict: Dict[str, Any], usage: CompletionUsage,
+                          num_subtopics: int) -> 'DeduplicationBatchResponse':
+        """Create from LLM response, with None for subtopics missing from it."""
+        results = []
+        for i in range(num_subtopics):
+            data = response_dict.get(f"subtopicId{i}")
+            results.append(DeduplicationResult.from_dict(data) if isinstance(data, dict) else None)
+        return cls(deduplication_results=results, usage=usage)
+    
+    @classmethod
+    def from_llm_content(cls, content: str, usage: CompletionUsage,
+                         num_subtopics: int) -> 'DeduplicationBatchResponse':
+        """Create directly from the raw JSON content of an LLM response."""
+        return cls.from_llm_response(JSONUtils.loads(content), usage, num_subtopics)
@@ -2,13 +2,18 @@
 Data models for the final T3C report.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
+import numpy as np
+from pytz import timezone
 from openai.types import CompletionUsage
 
+_PACIFIC_TZ = timezone('US/Pacific')
+_DATE_FORMAT = '%m/%d/%Y %H:%M:%S'
 
-@dataclass
+
+@dataclass(slots=True)
 class TokenUsage:
     """Represents token usage across all pipeline steps."""
     total_tokens: int
@@ -27,7 +32,7 @@ class TokenUsage:
         self.output_tokens += usage.completion_tokens
 
 
-@dataclass
+@dataclass(slots=True)
 class StepCost:
     """Represents cost for a single pipeline step."""
     step_name: str
@@ -41,7 +46,7 @@ class StepCost:
         self.token_usage.add_usage(usage)
 
 
-@dataclass
+@dataclass(slots=True)
 class CostSummary:
     """Represents cost summary for the entire pipeline."""
     estimated_cost: float
@@ -50,6 +55,7 @@ class CostSummary:
     step_costs: List[StepCost]
     provider_name: str
     model_name: str
+    step_costs_by_name: Dict[str, float]
     
     def __init__(self, provider_name: str, model_name: str, estimated_cost: float):
         self.provider_name = provider_name
@@ -58,10 +64,12 @@ class CostSummary:
         self.actual_cost = 0.0
         self.token_based_cost = 0.0
         self.step_costs = []
+        self.step_costs_by_name = {}
     
     def add_step_cost(self, step_cost: StepCost):
         """Add cost for a pipeline step."""
         self.step_costs.append(step_cost)
+        self.step_costs_by_name[step_cost.step_name] = step_cost.cost
         self.actual_cost += step_cost.cost
     
     def get_accuracy_percentage(self) -> float:
@@ -82,7 +90,7 @@ class CostSummary:
         return savings, percentage
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineStats:
     """Represents pipeline execution statistics."""
     comments_processed: int
@@ -92,6 +100,8 @@ class PipelineStats:
     duplicate_groups: int
     total_tokens_used: int
     processing_time: float
+    total_chars: int
+    avg_comment_length: float
     
     def __init__(self):
         self.comments_processed = 0
@@ -101,9 +111,23 @@ class PipelineStats:
         self.duplicate_groups = 0
         self.total_tokens_used = 0
         self.processing_time = 0.0
+        self.total_chars = 0
+        self.avg_comment_length = 0.0
+    
+    def compute_from_comments(self, comments: List[str]):
+        """Compute comment count and character statistics."""
+        self.comments_processed = len(comments)
+        if not comments:
+            self.total_chars = 0
+            self.avg_comment_length = 0.0
+            return
+        
+        lengths = np.fromiter(map(len, comments), dtype=np.int64, count=len(comments))
+        self.total_chars = int(lengths.sum())
+        self.avg_comment_length = float(lengths.mean())
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportTopic:
     """Represents a topic in the final report."""
     topic_name: str
@@ -114,9 +138,17 @@ class ReportTopic:
         self.topic_name = topic_name
         self.claims = claims
         self.total_claims = len(claims)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary format."""
+        return {
+            "topic_name": self.topic_name,
+            "total_claims": self.total_claims,
+            "claims": self.claims
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportTheme:
     """Represents a theme in the final report."""
     theme_name: str
@@ -127,9 +159,17 @@ class ReportTheme:
         self.theme_name = theme_name
         self.topics = topics
         self.total_claims = sum(topic.total_claims for topic in topics)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary format."""
+        return {
+            "theme_name": self.theme_name,
+            "total_claims": self.total_claims,
+            "topics": [topic.to_dict() for topic in self.topics]
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class T3CReport:
     """Represents the final T3C report."""
     themes: List[ReportTheme]
@@ -138,6 +178,8 @@ class T3CReport:
     run_name: str
     timestamp: datetime
     structured_json: Dict[str, Any] = None  # New field for structured JSON output
+    _total_topics: int = field(default=0, repr=False, compare=False)
+    _total_claims: int = field(default=0, repr=False, compare=False)
     
     def __init__(self, run_name: str, cost_summary: CostSummary):
         self.run_name = run_name
@@ -145,10 +187,15 @@ class T3CReport:
         self.themes = []
         self.pipeline_stats = PipelineStats()
         self.cost_summary = cost_summary
+        self.structured_json = None
+        self._total_topics = 0
+        self._total_claims = 0
     
     def add_theme(self, theme: ReportTheme):
         """Add a theme to the report."""
         self.themes.append(theme)
+        self._total_topics += len(theme.topics)
+        self._total_claims += theme.total_claims
     
     def get_total_themes(self) -> int:
         """Get total number of themes."""
@@ -156,64 +203,35 @@ class T3CReport:
     
     def get_total_topics(self) -> int:
         """Get total number of topics."""
-        return sum(len(theme.topics) for theme in self.themes)
+        return self._total_topics
     
     def get_total_claims(self) -> int:
         """Get total number of claims."""
-        return sum(theme.total_claims for theme in self.themes)
+        return self._total_claims
     
     def to_csv_log(self, exp_group: str) -> str:
         """Generate CSV log entry."""
-        from pytz import timezone
-        import pytz
-        
-        date_format = '%m/%d/%Y %H:%M:%S'
-        date = datetime.now()
-        date = date.astimezone(timezone('US/Pacific'))
-        time_str = date.strftime(date_format)
+        time_str = datetime.now(_PACIFIC_TZ).strftime(_DATE_FORMAT)
         
         # Get step costs
-        step_costs = {step.step_name: step.cost for step in self.cost_summary.step_costs}
-        
-        log_row = [
-            self.run_name,
-            exp_group,
-            time_str,
-            self.pipeline_stats.comments_processed,
-            "N/A",  # character count placeholder
-            round(self.cost_summary.estimated_cost, 4),
-            round(self.cost_summary.token_based_cost, 4),
-            round(self.cost_summary.actual_cost, 4),
-            round(step_costs.get("taxonomy", 0), 4),
-            round(step_costs.get("claims", 0), 4),
-            round(step_costs.get("deduplication", 0), 4),
-            self.pipeline_stats.themes_identified,
-            self.pipeline_stats.topics_identified,
-            self.pipeline_stats.claims_extracted
-        ]
+        step_costs = self.cost_summary.step_costs_by_name
+        stats = self.pipeline_stats
+        costs = self.cost_summary
         
-        return ",".join([str(x) for x in log_row])
+        return (
+            f"{self.run_name},{exp_group},{time_str},{stats.comments_processed},{stats.total_chars},"
+            f"{costs.estimated_cost:.4f},{costs.token_based_cost:.4f},{costs.actual_cost:.4f},"
+            f"{step_costs.get('taxonomy', 0):.4f},{step_costs.get('claims', 0):.4f},"
+            f"{step_costs.get('deduplication', 0):.4f},"
+            f"{stats.themes_identified},{stats.topics_identified},{stats.claims_extracted}"
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert report to dictionary."""
         return {
             "run_name": self.run_name,
             "timestamp": self.timestamp.isoformat(),
-            "themes": [
-                {
-                    "theme_name": theme.theme_name,
-                    "total_claims": theme.total_claims,
-                    "topics": [
-                        {
-                            "topic_name": topic.topic_name,
-                            "total_claims": topic.total_claims,
-                            "claims": topic.claims
-                        }
-                        for topic in theme.topics
-                    ]
-                }
-                for theme in self.themes
-            ],
+            "themes": [theme.to_dict() for theme in self.themes],
             "pipeline_stats": {
                 "comments_processed": self.pipeline_stats.comments_processed,
                 "themes_identified": self.pipeline_stats.themes_identified,
@@ -221,7 +239,9 @@ class T3CReport:
                 "claims_extracted": self.pipeline_stats.claims_extracted,
                 "duplicate_groups": self.pipeline_stats.duplicate_groups,
                 "total_tokens_used": self.pipeline_stats.total_tokens_used,
-                "processing_time": self.pipeline_stats.processing_time
+                "processing_time": self.pipeline_stats.processing_time,
+                "total_chars": self.pipeline_stats.total_chars,
+                "avg_comment_length": self.pipeline_stats.avg_comment_length
             },
             "cost_summary": {
                 "provider_name": self.cost_summary.provider_name,
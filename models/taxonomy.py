@@ -2,12 +2,23 @@
 Data models for taxonomy structures.
 """
 
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from openai.types import CompletionUsage
 
+from utils.json_utils import JSONUtils
 
-@dataclass
+# Interned field names used by the LLM taxonomy JSON
+_K_TAXONOMY = sys.intern("taxonomy")
+_K_TOPIC = sys.intern("topicName")
+_K_TOPIC_DESC = sys.intern("topicShortDescription")
+_K_SUBTOPICS = sys.intern("subtopics")
+_K_SUBTOPIC = sys.intern("subtopicName")
+_K_SUBTOPIC_DESC = sys.intern("subtopicShortDescription")
+
+
+@dataclass(frozen=True, slots=True)
 class Subtopic:
     """Represents a subtopic within a main topic."""
     subtopic_name: str
@@ -16,60 +27,59 @@ class Subtopic:
     def to_dict(self) -> Dict[str, str]:
         """Convert to dictionary format."""
         return {
-            "subtopicName": self.subtopic_name,
-            "subtopicShortDescription": self.subtopic_short_description
+            _K_SUBTOPIC: self.subtopic_name,
+            _K_SUBTOPIC_DESC: self.subtopic_short_description
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> 'Subtopic':
         """Create from dictionary."""
-        return cls(
-            subtopic_name=data["subtopicName"],
-            subtopic_short_description=data["subtopicShortDescription"]
-        )
+        return cls(data[_K_SUBTOPIC], data[_K_SUBTOPIC_DESC])
 
 
-@dataclass
+@dataclass(slots=True)
 class Topic:
     """Represents a main topic with subtopics."""
     topic_name: str
     topic_short_description: str
-    subtopics: List[Subtopic]
+    subtopics: Tuple[Subtopic, ...]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
         return {
-            "topicName": self.topic_name,
-            "topicShortDescription": self.topic_short_description,
-            "subtopics": [subtopic.to_dict() for subtopic in self.subtopics]
+            _K_TOPIC: self.topic_name,
+            _K_TOPIC_DESC: self.topic_short_description,
+            _K_SUBTOPICS: [subtopic.to_dict() for subtopic in self.subtopics]
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Topic':
         """Create from dictionary."""
+        subtopic_cls = Subtopic
         return cls(
-            topic_name=data["topicName"],
-            topic_short_description=data["topicShortDescription"],
-            subtopics=[Subtopic.from_dict(st) for st in data["subtopics"]]
+            data[_K_TOPIC],
+            data[_K_TOPIC_DESC],
+            tuple([subtopic_cls(st[_K_SUBTOPIC], st[_K_SUBTOPIC_DESC]) for st in data[_K_SUBTOPICS]])
         )
 
 
 @dataclass
 class Taxonomy:
     """Represents the complete taxonomy structure."""
-    taxonomy: List[Topic]
+    taxonomy: Tuple[Topic, ...]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
         return {
-            "taxonomy": [topic.to_dict() for topic in self.taxonomy]
+            _K_TAXONOMY: [topic.to_dict() for topic in self.taxonomy]
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Taxonomy':
         """Create from dictionary."""
+        topic_from_dict = Topic.from_dict
         return cls(
-            taxonomy=[Topic.from_dict(topic) for topic in data["taxonomy"]]
+            taxonomy=tuple([topic_from_dict(topic) for topic in data[_K_TAXONOMY]])
         )
     
     def get_topic_tree(self) -> List[Dict[str, Any]]:
@@ -110,4 +120,9 @@ class TaxonomyResponse:
         return cls(
             taxonomy=Taxonomy.from_dict(response_dict),
             usage=usage
-        ) 
\ No newline at end of file
+        )
+    
+    @classmethod
+    def from_llm_content(cls, content: str, usage: CompletionUsage) -> 'TaxonomyResponse':
+        """Create directly from the raw JSON content of an LLM response."""
+        return cls.from_llm_response(JSONUtils.loads(content), usage) 
\ No newline at end of file
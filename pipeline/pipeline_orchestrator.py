@@ -4,7 +4,10 @@ Coordinates all pipeline steps and generates the final T3C report.
 """
 
 import time
+from operator import itemgetter
+from dataclasses import asdict
 from typing import List, Dict, Any
+from openai.types import CompletionUsage
 
 from providers.base_provider import BaseLLMProvider
 from models.report import T3CReport, CostSummary, StepCost, ReportTheme, ReportTopic
@@ -46,10 +49,12 @@ class PipelineOrchestrator:
         print(f"📊 Processing {final_count} comments ({original_count} original)")
         print(f"📊 Total characters: {comment_stats['total_chars']}, Average length: {comment_stats['avg_length']:.1f}")
         
-        # Estimate costs
+        # Estimate costs, reusing the character total from the comment stats
         cost_estimator = CostEstimator(self.provider.config)
-        estimated_cost = cost_estimator.estimate_total_cost(comments)
-        cost_breakdown = cost_estimator.get_cost_breakdown(comments)
+        comments_total = comment_stats["total_chars"]
+        unique = CostEstimator.unique_comments(comments, comments_total)
+        estimated_cost = cost_estimator.estimate_total_cost(comments, comments_total, unique)
+        cost_breakdown = cost_estimator.get_cost_breakdown(comments, comments_total, unique)
         
         print(f"💰 Estimated cost: ${estimated_cost:.4f}")
         print(f"💰 Cost breakdown: {cost_breakdown}")
@@ -67,7 +72,7 @@ class PipelineOrchestrator:
         
         # Initialize report
         report = T3CReport(run_name, cost_summary)
-        report.pipeline_stats.comments_processed = final_count
+        report.pipeline_stats.compute_from_comments(comments)
         
         # Step 1: Create taxonomy
         print(f"\n{Formatter.format_step_progress(1, 'Creating taxonomy', self.provider.config.name)}")
@@ -79,12 +84,22 @@ class PipelineOrchestrator:
         report.pipeline_stats.themes_identified = step1_result["num_themes"]
         report.pipeline_stats.topics_identified = step1_result["num_topics"]
         
-        # Step 2: Extract claims
+        # Step 2: Extract claims once per distinct comment
         print(f"\n{Formatter.format_step_progress(2, 'Extracting claims', self.provider.config.name)}")
-        step2_result = self.claims_extractor.execute(step1_result["taxonomy"], comments)
+        unique_index: Dict[str, int] = {}
+        for comment in comments:
+            unique_index.setdefault(comment, len(unique_index))
+        unique_comments = list(unique_index)
+        if len(unique_comments) < len(comments):
+            print(f"♻️  Deduped {len(comments)}→{len(unique_comments)} comments before claims extraction")
+        
+        step2_result = self.claims_extractor.execute(step1_result["taxonomy"], unique_comments)
+        
+        # Fan claims back out so repeated comments still count towards topic totals
+        unique_claims = step2_result["all_claims"]
+        all_claims = [unique_claims[unique_index[comment]] for comment in comments]
         
         # Create a proper CompletionUsage object from the dictionary
-        from openai.types import CompletionUsage
         step2_usage = CompletionUsage(
             prompt_tokens=step2_result["total_usage"]["input_tokens"],
             completion_tokens=step2_result["total_usage"]["output_tokens"],
@@ -97,7 +112,7 @@ class PipelineOrchestrator:
         print(f"\n{Formatter.format_step_progress(3, 'Sorting taxonomy', 'N/A')}")
         step3_result = self.taxonomy_sorter.execute(
             step1_result["taxonomy_dict"], 
-            step2_result["all_claims"], 
+            all_claims, 
             comments
         )
         
@@ -146,7 +161,6 @@ class PipelineOrchestrator:
             report.structured_json = step5_result["structured_json"]
             
             # Add step 5 cost to summary
-            from openai.types import CompletionUsage
             step5_usage = CompletionUsage(
                 prompt_tokens=step5_result["usage"].prompt_tokens,
                 completion_tokens=step5_result["usage"].completion_tokens,
@@ -174,29 +188,37 @@ class PipelineOrchestrator:
         """Generate report themes with deduplicated claims."""
         themes = []
         
-        # Sort topics by claim count
-        sorted_topics = sorted(
-            sorted_taxonomy.topics.items(),
-            key=lambda x: x[1].total_count,
-            reverse=True
-        )
+        # Format each duplicated claim once, however many subtopics it appears in
+        formatted_claims = {
+            claim: f"{claim} ({len(duplicate_indices) + 1}x)"
+            for claim, duplicate_indices in duplicate_groups.items()
+        }
         
-        for topic_name, topic_claims in sorted_topics:
+        # Sort topics by claim count
+        by_count = itemgetter(0)
+        sorted_topics = [
+            (topic_claims.total_count, topic_name, topic_claims)
+            for topic_name, topic_claims in sorted_taxonomy.topics.items()
+        ]
+        sorted_topics.sort(key=by_count, reverse=True)
+        
+        for _, topic_name, topic_claims in sorted_topics:
             # Create report topics
             report_topics = []
             
             # Sort subtopics by claim count
-            sorted_subtopics = sorted(
-                topic_claims.subtopics.items(),
-                key=lambda x: x[1].total_count,
-                reverse=True
-            )
+            subtopic_items = topic_claims.subtopics.items()
+            sorted_subtopics = [
+                (subtopic_claims.total_count, subtopic_name, subtopic_claims)
+                for subtopic_name, subtopic_claims in subtopic_items
+            ]
+            sorted_subtopics.sort(key=by_count, reverse=True)
             
-            for subtopic_name, subtopic_claims in sorted_subtopics:
+            for _, subtopic_name, subtopic_claims in sorted_subtopics:
                 # Apply deduplication
                 processed_claims = self._apply_deduplication(
                     subtopic_claims.claims, 
-                    duplicate_groups
+                    formatted_claims
                 )
                 
                 report_topic = ReportTopic(subtopic_name, processed_claims)
@@ -207,20 +229,9 @@ class PipelineOrchestrator:
         
         return themes
     
-    def _apply_deduplication(self, claims: List[str], duplicate_groups: Dict[str, List[int]]) -> List[str]:
-        """Apply deduplication to claims list."""
-        processed_claims = []
-        
-        for claim in claims:
-            if claim in duplicate_groups:
-                # This claim has duplicates
-                duplicate_count = len(duplicate_groups[claim]) + 1
-                processed_claim = f"{claim} ({duplicate_count}x)"
-                processed_claims.append(processed_claim)
-            else:
-                processed_claims.append(claim)
-        
-        return processed_claims
+    def _apply_deduplication(self, claims: List[str], formatted_claims: Dict[str, str]) -> List[str]:
+        """Apply deduplication to claims list, replacing duplicated claims with their counted form."""
+        return [formatted_claims.get(claim, claim) for claim in claims]
     
     def _print_final_summary(self, report: T3CReport, cost_breakdown: Dict[str, Any], 
                            processing_time: float):
@@ -229,7 +240,7 @@ class PipelineOrchestrator:
         
         # Cost summary
         cost_summary = report.cost_summary
-        print(f"\n{Formatter.format_cost_summary(cost_summary.__dict__)}")
+        print(f"\n{Formatter.format_cost_summary(asdict(cost_summary))}")
         
         if cost_summary.provider_name == "OpenRouter (Gemini 2.0 Flash)":
             openai_cost = cost_summary.get_openai_equivalent_cost()
@@ -3,17 +3,35 @@ Step 2: Comments to Claims
 For each comment, extract all claims and assign them to a specific topic node in the taxonomy tree.
 """
 
+import asyncio
 import weave
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+from typing import List, Dict, Any, Optional
+from openai.types import CompletionUsage
 
+from config import Config
 from providers.base_provider import BaseLLMProvider
 from prompts.prompts import SystemPrompts
 from models.taxonomy import Taxonomy
 from models.claims import ClaimsResponse, ClaimsExtraction
+from utils.claims_cache import ClaimsCache
 from utils.formatting import Formatter
 from utils.logging_utils import Logger
 
 
+def _run_sync(coro):
+    """Run a coroutine to completion from synchronous code, even inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # Already inside an event loop (e.g. a notebook): run on a worker thread with its own loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 class ClaimsExtractor:
     """Step 2: Extract claims from comments."""
     
@@ -23,24 +41,95 @@ class ClaimsExtractor:
         self.logger = logger
     
     @weave.op()
-    def extract_claims(self, taxonomy_dict: Dict[str, Any], comment: str) -> ClaimsResponse:
+    def extract_claims(self, taxonomy_dict: Dict[str, Any], comment: str,
+                       prompt_prefix: Optional[str] = None) -> ClaimsResponse:
         """Extract claims from a comment using the LLM provider."""
         
         # Create prompts
         system_prompt = SystemPrompts.SYSTEM_PROMPT
-        user_prompt = SystemPrompts.get_claims_prompt(taxonomy_dict, comment)
+        user_prompt = SystemPrompts.get_claims_prompt(taxonomy_dict, comment, prefix=prompt_prefix)
         
         # Call LLM provider
         response = self.provider.extract_claims(system_prompt, user_prompt)
         
         return response
     
+    @weave.op()
+    async def extract_claims_async(self, taxonomy_dict: Dict[str, Any], comment: str,
+                                   prompt_prefix: Optional[str] = None) -> ClaimsResponse:
+        """Extract claims from a comment using the provider's async client."""
+        
+        # Create prompts
+        system_prompt = SystemPrompts.SYSTEM_PROMPT
+        user_prompt = SystemPrompts.get_claims_prompt(taxonomy_dict, comment, prefix=prompt_prefix)
+        
+        # Call LLM provider
+        response = await self.provider.extract_claims_async(system_prompt, user_prompt)
+        
+        return response
+    
+    @weave.op()
+    def extract_claims_multi(self, taxonomy_dict: Dict[str, Any], comments: List[str]) -> List[ClaimsResponse]:
+        """Extract claims from several comments in one request, one response per comment."""
+        
+        # Create prompts
+        system_prompt = SystemPrompts.SYSTEM_PROMPT
+        user_prompt = SystemPrompts.get_claims_multi_prompt(taxonomy_dict, comments)
+        
+        # Call LLM provider
+        response = self.provider.extract_claims_multi(system_prompt, user_prompt, len(comments))
+        
+        # Share the request's usage across its comments
+        usages = self.split_usage(response.usage, len(comments))
+        responses = []
+        for comment, extraction, usage in zip(comments, response.claims_extractions, usages):
+            if extraction is None:
+                print("⚠️  No claims result for a comment in a multi-comment request, retrying individually")
+                retry = self.extract_claims(taxonomy_dict, comment)
+                
+                # Keep this comment's share of the failed request in its usage
+                retry.usage = CompletionUsage(
+                    prompt_tokens=retry.usage.prompt_tokens + usage.prompt_tokens,
+                    completion_tokens=retry.usage.completion_tokens + usage.completion_tokens,
+                    total_tokens=retry.usage.total_tokens + usage.total_tokens
+                )
+                responses.append(retry)
+            else:
+                responses.append(ClaimsResponse(claims_extraction=extraction, usage=usage))
+        
+        return responses
+    
+    @staticmethod
+    def split_usage(usage: CompletionUsage, parts: int) -> List[CompletionUsage]:
+        """Split token usage evenly into parts, giving any remainder to the first."""
+        def shares(total: int) -> List[int]:
+            share, remainder = divmod(total, parts)
+            return [share + remainder] + [share] * (parts - 1)
+        
+        return [
+            CompletionUsage(prompt_tokens=p, completion_tokens=c, total_tokens=p + c)
+            for p, c in zip(shares(usage.prompt_tokens), shares(usage.completion_tokens))
+        ]
+    
+    @weave.op()
+    def extract_claims_batch(self, taxonomy_dict: Dict[str, Any], comments: List[str]) -> List[ClaimsResponse]:
+        """Extract claims from all comments in one provider batch job."""
+        
+        # Create prompts
+        system_prompt = SystemPrompts.SYSTEM_PROMPT
+        prompt_prefix = SystemPrompts.get_claims_prompt_prefix(taxonomy_dict)
+        user_prompts = [prompt_prefix + comment for comment in comments]
+        
+        # Call LLM provider
+        return self.provider.extract_claims_batch(system_prompt, user_prompts)
+    
     def execute(self, taxonomy: Taxonomy, comments: List[str]) -> Dict[str, Any]:
         """Execute Step 2: Comments to Claims."""
         
         print(Formatter.format_step_progress(2, "Extracting claims", self.provider.config.name))
         
         taxonomy_dict = taxonomy.to_dict()
+        prompt_prefix = SystemPrompts.get_claims_prompt_prefix(taxonomy_dict)
         
         # Track totals
         total_usage = {
@@ -49,53 +138,120 @@ class ClaimsExtractor:
             "output_tokens": 0
         }
         total_cost = 0.0
-        all_claims = []
-        claims_data_for_logging = []
-        
-        # Process each comment
-        with weave.attributes({
-            "model": self.provider.config.model,
-            "provider": self.provider.config.name,
-            "stage": "2_comment_to_claims"
-        }):
-            for i, comment in enumerate(comments):
-                print(f"   Processing comment {i+1}/{len(comments)}...")
-                
-                # Extract claims
-                response = self.extract_claims(taxonomy_dict, comment)
-                
-                # Calculate cost
-                cost = self.provider.calculate_cost(response.usage)
-                total_cost += cost
-                
-                # Update totals
-                total_usage["total_tokens"] += response.usage.total_tokens
-                total_usage["input_tokens"] += response.usage.prompt_tokens
-                total_usage["output_tokens"] += response.usage.completion_tokens
-                
-                # Store claims
-                all_claims.append(response.claims_extraction)
-                
-                # Prepare logging data
-                claims_dict = response.claims_extraction.to_dict()
-                claims_html = Formatter.cute_print(claims_dict)
-                claims_data_for_logging.append([
-                    comment,
-                    claims_html,
-                    Formatter.format_json_pretty(claims_dict)
-                ])
-                
-                # Print progress
+        all_claims = [None] * len(comments)
+        claims_data_for_logging = [None] * len(comments)
+        
+        runtime_config = self.logger.runtime_config
+        use_batch_api = runtime_config.use_batch_api
+        if use_batch_api and not self.provider.supports_batch_api:
+            print(f"⚠️  {self.provider.config.name} does not support the Batch API, using concurrent requests")
+            use_batch_api = False
+        
+        # Batch API requests use the single-comment prompt
+        batch_size = 1 if use_batch_api else runtime_config.claims_batch_size
+        cache = ClaimsCache(taxonomy_dict, self.provider.config.model, batch_size) if runtime_config.use_claims_cache else None
+        
+        def record_response(i: int, comment: str, response: ClaimsResponse):
+            nonlocal total_cost
+            
+            # Calculate cost (Batch API results are billed at the discounted rate)
+            cost = self.provider.calculate_cost(response.usage, batch=response.batch_priced)
+            total_cost += cost
+            
+            # Update totals
+            total_usage["total_tokens"] += response.usage.total_tokens
+            total_usage["input_tokens"] += response.usage.prompt_tokens
+            total_usage["output_tokens"] += response.usage.completion_tokens
+            
+            # Store claims in comment order
+            all_claims[i] = response.claims_extraction
+            
+            # Prepare logging data (formatted by the logger when written)
+            claims_dict = response.claims_extraction.to_dict()
+            claims_data_for_logging[i] = [comment, claims_dict]
+            
+            # Update progress
+            progress.update(1)
+            if runtime_config.debug_mode:
                 num_claims = response.claims_extraction.get_num_claims()
-                print(Formatter.format_claims_summary(comment, num_claims))
-                
-                # Log individual step
-                usage_stats = {
-                    "total_tokens": response.usage.total_tokens,
-                    "input_tokens": response.usage.prompt_tokens,
-                    "output_tokens": response.usage.completion_tokens
-                }
-                self.logger.log_claims_step(comment, claims_dict, usage_stats, total_usage)
+                progress.write(Formatter.format_claims_summary(comment, num_claims))
+            
+            # Log individual step
+            usage_stats = {
+                "total_tokens": response.usage.total_tokens,
+                "input_tokens": response.usage.prompt_tokens,
+                "output_tokens": response.usage.completion_tokens
+            }
+            self.logger.log_claims_step(comment, claims_dict, usage_stats, total_usage)
+        
+        async def process_chunk(semaphore: asyncio.Semaphore, indices: List[int]):
+            chunk = [comments[i] for i in indices]
+            async with semaphore:
+                if len(chunk) == 1:
+                    responses = [await self.extract_claims_async(taxonomy_dict, chunk[0], prompt_prefix)]
+                else:
+                    # Multi-comment requests run on the sync client off the event loop
+                    responses = await asyncio.to_thread(self.extract_claims_multi, taxonomy_dict, chunk)
+            
+            for i, comment, response in zip(indices, chunk, responses):
+                if cache:
+                    cache.put(comment, response)
+                record_response(i, comment, response)
+        
+        async def process_all():
+            pending = []
+            for i, comment in enumerate(comments):
+                response = cache.get(comment) if cache else None
+                if response is None:
+                    pending.append(i)
+                else:
+                    record_response(i, comment, response)
+            
+            semaphore = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
+            async with self.provider.async_session():
+                # Let every request finish so completed claims are recorded and cached
+                # before the first failure is raised
+                results = await asyncio.gather(*(
+                    process_chunk(semaphore, pending[start:start + batch_size])
+                    for start in range(0, len(pending), batch_size)
+                ), return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        
+        try:
+            with tqdm(total=len(comments), desc="   Extracting claims", unit="comment") as progress, weave.attributes({
+                "model": self.provider.config.model,
+                "provider": self.provider.config.name,
+                "stage": "2_comment_to_claims"
+            }):
+                if use_batch_api:
+                    responses = [cache.get(comment) if cache else None for comment in comments]
+                    pending = [i for i, response in enumerate(responses) if response is None]
+                    
+                    # Submit every uncached comment as a single batch job
+                    if pending:
+                        batch_responses = self.extract_claims_batch(taxonomy_dict, [comments[i] for i in pending])
+                        discount = self.provider.config.batch_discount
+                        if discount != 1.0:
+                            print(f"💸 Costs use batch pricing ({discount:.0%} of standard rates)")
+                        for i, response in zip(pending, batch_responses):
+                            responses[i] = response
+                            if cache:
+                                cache.put(comments[i], response)
+                    
+                    for i, (comment, response) in enumerate(zip(comments, responses)):
+                        record_response(i, comment, response)
+                else:
+                    # Process comments concurrently
+                    _run_sync(process_all())
+        finally:
+            # Keep claims that were already extracted (and paid for), even if a request failed
+            if cache:
+                cache.save()
+        
+        if cache:
+            print(f"♻️  Claims cache hits: {cache.hits}/{len(comments)}")
         
         # Log summary
         self.logger.log_claims_summary(claims_data_for_logging, total_cost)
@@ -4,6 +4,8 @@ Sort the themes and topics by claim frequency so that the most discussed topics
 This step does not require LLM calls.
 """
 
+from collections import Counter, defaultdict
+from itertools import chain
 from typing import List, Dict, Any
 
 from models.claims import ClaimsExtraction, SortedTaxonomy, TopicClaims, SubtopicClaims
@@ -22,34 +24,27 @@ class TaxonomySorter:
                      comments: List[str]) -> SortedTaxonomy:
         """Sort taxonomy by claim frequency."""
         
-        # Build claim counts by topic/subtopic
-        topic_claims = {}
+        # Build claim lists by topic/subtopic, counting claims per topic as we go
+        topic_claims: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        topic_totals = Counter()
         
-        # Process each comment's claims
-        for comment, claims_extraction in zip(comments, all_claims):
-            for claim in claims_extraction.claims:
-                topic_name = claim.topic_name
-                subtopic_name = claim.subtopic_name
-                
-                # Initialize topic if not exists
-                if topic_name not in topic_claims:
-                    topic_claims[topic_name] = {}
-                
-                # Initialize subtopic if not exists
-                if subtopic_name not in topic_claims[topic_name]:
-                    topic_claims[topic_name][subtopic_name] = []
-                
-                # Add claim text
-                topic_claims[topic_name][subtopic_name].append(claim.claim)
+        # Process every comment's claims in one flat pass
+        for claim in chain.from_iterable(extraction.claims for extraction in all_claims):
+            topic_claims[claim.topic_name][claim.subtopic_name].append(claim.claim)
+            topic_totals[claim.topic_name] += 1
         
         # Convert to structured format
-        structured_topics = {}
-        for topic_name, subtopics in topic_claims.items():
-            subtopic_claims = {}
-            for subtopic_name, claims in subtopics.items():
-                subtopic_claims[subtopic_name] = SubtopicClaims(subtopic_name, claims)
-            
-            structured_topics[topic_name] = TopicClaims(topic_name, subtopic_claims)
+        structured_topics = {
+            topic_name: TopicClaims(
+                topic_name,
+                {
+                    subtopic_name: SubtopicClaims(subtopic_name, claims)
+                    for subtopic_name, claims in subtopics.items()
+                },
+                total_count=topic_totals[topic_name]
+            )
+            for topic_name, subtopics in topic_claims.items()
+        }
         
         return SortedTaxonomy(structured_topics)
     
@@ -69,21 +64,13 @@ class TaxonomySorter:
         print("✅ Taxonomy sorted successfully!")
         print(f"📊 Total topics: {total_topics}, Total claims: {total_claims}")
         
-        # Convert to legacy format for compatibility
-        legacy_format = {}
-        for topic_name, topic_claims in sorted_taxonomy.topics.items():
-            legacy_format[topic_name] = {
-                "total": topic_claims.total_count,
-                "subtopics": {}
-            }
-            for subtopic_name, subtopic_claims in topic_claims.subtopics.items():
-                legacy_format[topic_name]["subtopics"][subtopic_name] = {
-                    "total": subtopic_claims.total_count,
-                    "claims": subtopic_claims.claims
-                }
-        
-        # Log to W&B
-        self.logger.log_sorting_step(legacy_format)
+        # Convert to legacy format for compatibility, only when it will be logged
+        legacy_format = None
+        if self.logger.needs_legacy_format:
+            legacy_format = sorted_taxonomy.to_legacy_dict()
+            
+            # Log to W&B
+            self.logger.log_sorting_step(legacy_format)
         
         return {
             "sorted_taxonomy": sorted_taxonomy,
@@ -3,12 +3,16 @@ Step 4: Deduplicate Claims
 Find similar claims in each subtopic and group them together.
 """
 
+import contextvars
 import weave
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple
+from openai.types import CompletionUsage
 
+from config import Config
 from providers.base_provider import BaseLLMProvider
 from prompts.prompts import SystemPrompts
-from models.claims import DeduplicationResponse, SortedTaxonomy
+from models.claims import DeduplicationResponse, DeduplicationBatchResponse, DeduplicationResult, SortedTaxonomy
 from utils.formatting import Formatter
 from utils.logging_utils import Logger
 
@@ -34,6 +38,62 @@ class ClaimsDeduplicator:
         
         return response
     
+    @weave.op()
+    def deduplicate_claims_batch(self, claims_lists: List[List[str]]) -> DeduplicationBatchResponse:
+        """Deduplicate several subtopics' claims in one request using the LLM provider."""
+        
+        # Create prompts
+        system_prompt = SystemPrompts.SYSTEM_PROMPT
+        user_prompt = SystemPrompts.get_dedup_batch_prompt(claims_lists)
+        
+        # Call LLM provider
+        response = self.provider.deduplicate_claims_batch(system_prompt, user_prompt, len(claims_lists))
+        
+        return response
+    
+    @staticmethod
+    def pack_batches(jobs: List[Tuple[str, List[str]]], max_tokens: int) -> List[List[Tuple[str, List[str]]]]:
+        """Greedily pack subtopic jobs into batches within the dedup token budget (0 disables packing)."""
+        if max_tokens <= 0:
+            return [[job] for job in jobs]
+        
+        batches = []
+        current = []
+        current_tokens = 0
+        for job in jobs:
+            tokens = sum(map(len, job[1])) // Config.CHARS_PER_TOKEN
+            if current and current_tokens + tokens > max_tokens:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(job)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    def deduplicate_batch(self, batch: List[Tuple[str, List[str]]]) -> Tuple[List[DeduplicationResult], List[CompletionUsage]]:
+        """Deduplicate a packed batch, returning one result per subtopic and the usage of each call."""
+        # Single (or oversized) subtopics use the standard prompt
+        if len(batch) == 1:
+            response = self.deduplicate_claims(batch[0][1])
+            return [response.deduplication_result], [response.usage]
+        
+        response = self.deduplicate_claims_batch([claims_list for _, claims_list in batch])
+        results = list(response.deduplication_results)
+        usages = [response.usage]
+        
+        # Retry subtopics the batch response left out
+        for i, result in enumerate(results):
+            if result is None:
+                subtopic_name, claims_list = batch[i]
+                print(f"     ⚠️  No batch result for {subtopic_name}, retrying individually")
+                retry = self.deduplicate_claims(claims_list)
+                results[i] = retry.deduplication_result
+                usages.append(retry.usage)
+        
+        return results, usages
+    
     def execute(self, sorted_taxonomy: SortedTaxonomy) -> Dict[str, Any]:
         """Execute Step 4: Deduplicate Claims."""
         
@@ -50,78 +110,91 @@ class ClaimsDeduplicator:
         nested_claims = {}
         duplicate_groups = {}
         dedup_data_for_logging = []
-        topics_processed = 0
-        
-        # Process each topic and subtopic
-        with weave.attributes({
-            "model": self.provider.config.model,
-            "provider": self.provider.config.name,
-            "stage": "4_dedup_claims"
-        }):
-            for topic_name, topic_claims in sorted_taxonomy.topics.items():
-                for subtopic_name, subtopic_claims in topic_claims.subtopics.items():
-                    topics_processed += 1
-                    claims_list = subtopic_claims.claims
-                    
-                    print(f"   Processing topic {topics_processed}: {subtopic_name} ({len(claims_list)} claims)")
-                    
-                    # Skip topics with only one claim
-                    if len(claims_list) <= 1:
-                        print(f"     ⏭️  Skipping {subtopic_name} (only {len(claims_list)} claim)")
-                        continue
-                    
-                    # Deduplicate claims
-                    response = self.deduplicate_claims(claims_list)
-                    
-                    # Calculate cost
-                    cost = self.provider.calculate_cost(response.usage)
-                    total_cost += cost
-                    
-                    # Update totals
-                    total_usage["total_tokens"] += response.usage.total_tokens
-                    total_usage["input_tokens"] += response.usage.prompt_tokens
-                    total_usage["output_tokens"] += response.usage.completion_tokens
-                    
-                    # Check for duplicates
-                    has_duplicates = response.deduplication_result.has_duplicates()
-                    
-                    if has_duplicates:
-                        # Store duplicate information
-                        nested_claims[subtopic_name] = {
-                            "dupes": response.deduplication_result.to_dict(),
-                            "og": claims_list
-                        }
-                        
-                        # Extract duplicate groups
-                        for claim_key, claim_vals in response.deduplication_result.nesting.items():
-                            if len(claim_vals) > 0:
-                                # Extract index from claim key (e.g., "claimId2" -> 2)
-                                try:
-                                    main_claim_idx = int(claim_key.replace("claimId", ""))
-                                    duplicate_indices = [int(c_key.replace("claimId", "")) for c_key in claim_vals]
-                                    
-                                    main_claim = claims_list[main_claim_idx]
-                                    duplicate_groups[main_claim] = duplicate_indices
-                                except (ValueError, IndexError):
-                                    print(f"     ⚠️  Error processing claim indices for {subtopic_name}")
-                        
-                        print(f"     🔍 Found duplicates in {subtopic_name}")
+        
+        # Collect the subtopics that need deduplication, skipping those with only one claim
+        jobs = [
+            (subtopic_name, subtopic_claims.claims)
+            for topic_claims in sorted_taxonomy.topics.values()
+            for subtopic_name, subtopic_claims in topic_claims.subtopics.items()
+            if len(subtopic_claims.claims) > 1
+        ]
+        topics_processed = sorted_taxonomy.get_total_topics()
+        
+        for job_num, (subtopic_name, claims_list) in enumerate(jobs, 1):
+            print(f"   Processing topic {job_num}: {subtopic_name} ({len(claims_list)} claims)")
+        if topics_processed > len(jobs):
+            print(f"     ⏭️  Skipping {topics_processed - len(jobs)} subtopics with only one claim")
+        
+        # Pack small subtopics together to share the prompt overhead
+        batches = self.pack_batches(jobs, self.logger.runtime_config.dedup_batch_max_tokens)
+        
+        # Deduplicate all batches concurrently
+        responses = {}
+        if batches:
+            with weave.attributes({
+                "model": self.provider.config.model,
+                "provider": self.provider.config.name,
+                "stage": "4_dedup_claims"
+            }), ThreadPoolExecutor(max_workers=Config.LLM_MAX_CONCURRENCY) as executor:
+                futures = {
+                    executor.submit(contextvars.copy_context().run, self.deduplicate_batch, batch): idx
+                    for idx, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    responses[futures[future]] = future.result()
+        
+        # Merge results in subtopic order
+        for idx, batch in enumerate(batches):
+            results, usages = responses[idx]
+            
+            for usage in usages:
+                # Calculate cost
+                cost = self.provider.calculate_cost(usage)
+                total_cost += cost
+                
+                # Update totals
+                total_usage["total_tokens"] += usage.total_tokens
+                total_usage["input_tokens"] += usage.prompt_tokens
+                total_usage["output_tokens"] += usage.completion_tokens
+                
+                # Log individual step
+                usage_stats = {
+                    "total_tokens": usage.total_tokens,
+                    "input_tokens": usage.prompt_tokens,
+                    "output_tokens": usage.completion_tokens
+                }
+                self.logger.log_deduplication_step(usage_stats, total_usage)
+            
+            for (subtopic_name, claims_list), deduplication_result in zip(batch, results):
+                dedup_dict = deduplication_result.to_dict()
+                
+                # Check for duplicates
+                has_duplicates = deduplication_result.has_duplicates()
+                
+                if has_duplicates:
+                    # Store duplicate information
+                    nested_claims[subtopic_name] = {
+                        "dupes": dedup_dict,
+                        "og": claims_list
+                    }
                     
-                    # Prepare logging data
-                    dedup_dict = response.deduplication_result.to_dict()
-                    dedup_data_for_logging.append([
-                        "\n".join(claims_list),
-                        Formatter.cute_print(dedup_dict),
-                        Formatter.format_json_pretty(dedup_dict)
-                    ])
+                    # Extract duplicate groups
+                    for claim_key, claim_vals in deduplication_result.nesting.items():
+                        if len(claim_vals) > 0:
+                            # Extract index from claim key (e.g., "claimId2" -> 2)
+                            try:
+                                main_claim_idx = int(claim_key.removeprefix("claimId"))
+                                duplicate_indices = [int(c_key.removeprefix("claimId")) for c_key in claim_vals]
+                                
+                                main_claim = claims_list[main_claim_idx]
+                                duplicate_groups[main_claim] = duplicate_indices
+                            except (ValueError, IndexError):
+                                print(f"     ⚠️  Error processing claim indices for {subtopic_name}")
                     
-                    # Log individual step
-                    usage_stats = {
-                        "total_tokens": response.usage.total_tokens,
-                        "input_tokens": response.usage.prompt_tokens,
-                        "output_tokens": response.usage.completion_tokens
-                    }
-                    self.logger.log_deduplication_step(usage_stats, total_usage)
+                    print(f"     🔍 Found duplicates in {subtopic_name}")
+                
+                # Prepare logging data (formatted by the logger when written)
+                dedup_data_for_logging.append(["\n".join(claims_list), dedup_dict])
         
         # Log summary
         total_topics = sorted_taxonomy.get_total_topics()
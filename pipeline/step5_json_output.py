@@ -3,18 +3,26 @@ Step 5: Generate Structured JSON Output
 Convert the T3C report into the structured JSON format using OpenRouter's structured outputs.
 """
 
-import uuid
-import json
+import io
+import os
+import re
 import weave
 from typing import Dict, Any, List
+import openai
+from openai.types import CompletionUsage
 
+from config import Config
 from providers.base_provider import BaseLLMProvider
 from prompts.prompts import SystemPrompts
 from models.report import T3CReport
 from utils.json_schema_loader import JSONSchemaLoader
+from utils.json_utils import JSONUtils
 from utils.formatting import Formatter
 from utils.logging_utils import Logger
 
+# JSON object inside an optional code fence, ignoring any prose the model wraps around it
+_JSON_EXTRACT_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```|(\{.*\})", re.DOTALL)
+
 
 class StructuredJSONGenerator:
     """Step 5: Generate structured JSON output."""
@@ -25,6 +33,21 @@ class StructuredJSONGenerator:
         self.logger = logger
         self.formatter = Formatter()
         
+        # Load the output schema once so every request reuses the same response format
+        self._response_format = None
+        if provider.config.supports_structured_outputs:
+            try:
+                self._response_format = JSONSchemaLoader.get_t3c_response_format(Config.STRUCTURED_OUTPUT_STRICT)
+            except (OSError, JSONUtils.DecodeError) as e:
+                print(f"⚠️  Could not load T3C output schema, falling back to unstructured JSON: {e}")
+        self._schema_enforced = self._response_format is not None
+        
+        # Compiled once and shared between generators; None when jsonschema is not installed
+        try:
+            self._validator = JSONSchemaLoader.get_t3c_validator()
+        except (OSError, JSONUtils.DecodeError):
+            self._validator = None
+        
     @weave.op()
     def execute(self, report: T3CReport, comments: List[str], run_name: str) -> Dict[str, Any]:
         """
@@ -52,16 +75,30 @@ class StructuredJSONGenerator:
             
             print("✅ Structured JSON generated successfully!")
             
-            # Safely access the topics count
-            try:
-                data_array = structured_data.get('data', [])
-                if len(data_array) > 1 and isinstance(data_array[1], dict):
-                    topics_count = len(data_array[1].get('topics', []))
-                    print(f"📊 Generated {topics_count} topics")
-                else:
+            # Schema violations are reported but the parsed JSON is still returned
+            errors = None
+            if self._validator is not None:
+                errors = list(self._validator.iter_errors(structured_data))
+                if errors:
+                    print(f"⚠️  Structured JSON has {len(errors)} schema violation(s), first: {errors[0].message}")
+            
+            if self._schema_enforced and errors == []:
+                # Validated output has the T3C shape, but the schema does not require data[1]
+                try:
+                    print(f"📊 Generated {len(structured_data['data'][1]['topics'])} topics")
+                except IndexError:
                     print("📊 Structured data format confirmed")
-            except (IndexError, KeyError, TypeError) as e:
-                print(f"📊 Structured JSON generated (format verification skipped: {e})")
+            else:
+                # Safely access the topics count
+                try:
+                    data_array = structured_data.get('data', [])
+                    if len(data_array) > 1 and isinstance(data_array[1], dict):
+                        topics_count = len(data_array[1].get('topics', []))
+                        print(f"📊 Generated {topics_count} topics")
+                    else:
+                        print("📊 Structured data format confirmed")
+                except (IndexError, KeyError, TypeError) as e:
+                    print(f"📊 Structured JSON generated (format verification skipped: {e})")
             
             cost = self.provider.calculate_cost(response["usage"])
             print(f"💰 Step 5 cost: ${round(cost, 4)}")
@@ -104,14 +141,17 @@ class StructuredJSONGenerator:
             themes_info.append(theme_info)
         
         # Pre-generate all UUIDs in Python
-        json_structure = self._generate_uuid_structure(themes_info, comments, run_name)
+        json_structure = self._generate_uuid_structure_json(themes_info, run_name)
+        
+        comments_block = "\n".join(f"{i}. {comment}" for i, comment in enumerate(comments, 1))
+        themes_block = self._themes_block(themes_info)
         
         # Create a prompt with pre-generated UUIDs
         prompt = f"""
 Fill in the following JSON structure with the appropriate content. All UUIDs are already generated - DO NOT change them.
 
 JSON Structure to Fill:
-{json.dumps(json_structure, indent=2)}
+{json_structure}
 
 ## Your Task:
 1. Keep all "id" fields exactly as provided (these are real UUIDs)
@@ -124,18 +164,10 @@ JSON Structure to Fill:
 ## Data to convert:
 
 Comments:
-{chr(10).join([f"{i+1}. {comment}" for i, comment in enumerate(comments)])}
+{comments_block}
 
 Themes and Topics:
-{chr(10).join([
-    f"THEME: {theme_info['theme_name']}" + chr(10) +
-    chr(10).join([
-        f"  TOPIC: {topic_info['topic_name']}" + chr(10) +
-        f"  CLAIMS: {chr(10).join(['    - ' + claim for claim in topic_info['claims']])}"
-        for topic_info in theme_info["topics"]
-    ])
-    for theme_info in themes_info
-])}
+{themes_block}
 
 ## Important:
 - Return ONLY the filled JSON structure
@@ -146,119 +178,139 @@ Themes and Topics:
         
         return prompt
     
-    def _generate_uuid_structure(self, themes_info: List[Dict], comments: List[str], run_name: str) -> Dict[str, Any]:
-        """Generate the complete JSON structure with real UUIDs."""
+    @staticmethod
+    def _themes_block(themes_info: List[Dict]) -> str:
+        """Render the themes, topics and claims listing for the prompt in a single pass."""
+        buf = io.StringIO()
+        for theme_idx, theme_info in enumerate(themes_info):
+            if theme_idx:
+                buf.write("\n")
+            buf.write(f"THEME: {theme_info['theme_name']}\n")
+            for topic_idx, topic_info in enumerate(theme_info["topics"]):
+                if topic_idx:
+                    buf.write("\n")
+                buf.write(f"  TOPIC: {topic_info['topic_name']}\n  CLAIMS: ")
+                for claim_idx, claim in enumerate(topic_info["claims"]):
+                    if claim_idx:
+                        buf.write("\n")
+                    buf.write("    - ")
+                    buf.write(claim)
+        return buf.getvalue()
+    
+    def _generate_uuid_structure_json(self, themes_info: List[Dict], run_name: str) -> str:
+        """Generate the complete JSON structure with real UUIDs, written directly as compact JSON text."""
         
-        topics = []
+        # Draw every UUID up front: one per theme and topic, four per claim
+        num_ids = sum(
+            1 + sum(1 + 4 * len(topic_info["claims"]) for topic_info in theme_info["topics"])
+            for theme_info in themes_info
+        )
+        next_id = iter(self._bulk_uuid_strings(num_ids)).__next__
+        
+        buf = io.StringIO()
+        write = buf.write
+        write('{"data":["v0.2",{"title":')
+        write(JSONUtils.dumps(run_name))
+        write(',"description":"T3C Pipeline Analysis Results","addOns":{},"topics":[')
         
-        for theme_info in themes_info:
-            # Generate UUID for theme (becomes topic)
-            topic_id = str(uuid.uuid4())
+        for theme_idx, theme_info in enumerate(themes_info):
+            # Theme becomes a topic; the LLM fills in its title and description
+            write(',{"id":"' if theme_idx else '{"id":"')
+            write(next_id())
+            write('","title":"","description":"","subtopics":[')
             
-            subtopics = []
-            for topic_info in theme_info["topics"]:
-                # Generate UUID for topic (becomes subtopic)
-                subtopic_id = str(uuid.uuid4())
+            for topic_idx, topic_info in enumerate(theme_info["topics"]):
+                # Topic becomes a subtopic
+                write(',{"id":"' if topic_idx else '{"id":"')
+                write(next_id())
+                write('","title":"","description":"","claims":[')
                 
-                claims = []
-                for i, claim in enumerate(topic_info["claims"]):
-                    # Generate UUIDs for each claim
-                    claim_id = str(uuid.uuid4())
-                    quote_id = str(uuid.uuid4())
-                    reference_id = str(uuid.uuid4())
-                    source_id = str(uuid.uuid4())
-                    
-                    claim_obj = {
-                        "id": claim_id,
-                        "title": "",  # LLM will fill this
-                        "quotes": [
-                            {
-                                "id": quote_id,
-                                "text": "",  # LLM will fill this with original comment
-                                "reference": {
-                                    "id": reference_id,
-                                    "sourceId": source_id,
-                                    "interview": "",  # LLM will fill with Anonymous #N
-                                    "data": [
-                                        "text",
-                                        {
-                                            "startIdx": 0,  # LLM will fill
-                                            "endIdx": 0     # LLM will fill
-                                        }
-                                    ]
-                                }
-                            }
-                        ],
-                        "number": i + 1,
-                        "similarClaims": []
-                    }
-                    claims.append(claim_obj)
+                for i in range(len(topic_info["claims"])):
+                    # Claim, quote, reference and source UUIDs; the LLM fills in the text,
+                    # interview name and quote offsets
+                    write(',{"id":"' if i else '{"id":"')
+                    write(next_id())
+                    write('","title":"","quotes":[{"id":"')
+                    write(next_id())
+                    write('","text":"","reference":{"id":"')
+                    write(next_id())
+                    write('","sourceId":"')
+                    write(next_id())
+                    write('","interview":"","data":["text",{"startIdx":0,"endIdx":0}]}}],"number":')
+                    write(str(i + 1))
+                    write(',"similarClaims":[]}')
                 
-                subtopic_obj = {
-                    "id": subtopic_id,
-                    "title": "",  # LLM will fill with topic name
-                    "description": "",  # LLM will fill
-                    "claims": claims
-                }
-                subtopics.append(subtopic_obj)
-            
-            topic_obj = {
-                "id": topic_id,
-                "title": "",  # LLM will fill with theme name
-                "description": "",  # LLM will fill
-                "subtopics": subtopics
-            }
-            topics.append(topic_obj)
+                write(']}')
+            write(']}')
         
-        return {
-            "data": [
-                "v0.2",
-                {
-                    "title": run_name,
-                    "description": "T3C Pipeline Analysis Results",
-                    "addOns": {},
-                    "topics": topics
-                }
-            ]
-        }
+        write(']}]}')
+        return buf.getvalue()
+    
+    @staticmethod
+    def _bulk_uuid_strings(n: int) -> List[str]:
+        """Generate n random (version 4) UUID strings from a single os.urandom call."""
+        raw = bytearray(os.urandom(16 * n))
+        
+        # Set the version (4) and RFC 4122 variant bits of each 16-byte chunk
+        raw[6::16] = bytes(b & 0x0F | 0x40 for b in raw[6::16])
+        raw[8::16] = bytes(b & 0x3F | 0x80 for b in raw[8::16])
+        
+        h = raw.hex()
+        return [
+            f"{h[i:i+8]}-{h[i+8:i+12]}-{h[i+12:i+16]}-{h[i+16:i+20]}-{h[i+20:i+32]}"
+            for i in range(0, 32 * n, 32)
+        ]
     
     def _generate_structured_json(self, user_prompt: str) -> Dict[str, Any]:
-        """Generate structured JSON using OpenRouter without strict schema validation."""
+        """Generate structured JSON, enforcing the T3C schema when the provider supports it."""
         
-        # Create the modified client call without structured outputs for now
         messages = [
             {"role": "system", "content": "You are a helpful assistant that generates valid JSON responses."},
             {"role": "user", "content": user_prompt + "\n\nGenerate ONLY valid JSON, no other text."}
         ]
         
-        # Make the API call without structured outputs for now
-        response = self.provider.client.chat.completions.create(
-            model=self.provider.config.model,
-            messages=messages,
-            temperature=0.3,
-            max_tokens=4000  # Increased token limit
-        )
+        if self._response_format is not None:
+            try:
+                stream = self._create_stream(messages, response_format=self._response_format)
+            except (openai.BadRequestError, openai.UnprocessableEntityError) as e:
+                # Model or route rejected the schema; retry once with the prompt-only request
+                print(f"⚠️  Structured output rejected, retrying without response schema: {e}")
+                self._response_format = None
+                self._schema_enforced = False
+                stream = self._create_stream(messages)
+        else:
+            stream = self._create_stream(messages)
+        
+        # Collect the content deltas; usage arrives on the final chunk
+        content_parts = []
+        usage = None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content_parts.append(chunk.choices[0].delta.content)
+            if chunk.usage is not None:
+                usage = chunk.usage
+        if usage is None:
+            usage = CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
         
         # Parse the response
-        structured_content = response.choices[0].message.content
-        print(f"🔍 Debug - Raw response content: {structured_content[:200]}...")
+        structured_content = "".join(content_parts)
+        self.logger.debug(lambda: f"Raw response content: {structured_content[:200]}...")
         
-        # Clean up the response (remove code blocks if present)
-        if structured_content.startswith("```json"):
-            structured_content = structured_content[7:-3]  # Remove ```json and ```
-        elif structured_content.startswith("```"):
-            structured_content = structured_content[3:-3]  # Remove ``` and ```
+        # Clean up the response (extract the JSON from code blocks or prose); schema-enforced output is bare JSON
+        if self._response_format is None:
+            match = _JSON_EXTRACT_RE.search(structured_content)
+            if match:
+                structured_content = match.group(1) or match.group(2)
         
         try:
-            structured_json = json.loads(structured_content)
-            print(f"🔍 Debug - Parsed JSON keys: {list(structured_json.keys()) if structured_json else 'None'}")
+            structured_json = JSONUtils.loads(structured_content)
+            self.logger.debug(lambda: f"Parsed JSON keys: {list(structured_json.keys()) if structured_json else 'None'}")
             if structured_json and "data" in structured_json:
-                print(f"🔍 Debug - Data array length: {len(structured_json['data'])}")
+                self.logger.debug(lambda: f"Data array length: {len(structured_json['data'])}")
                 if len(structured_json['data']) > 1:
-                    topics = structured_json['data'][1].get('topics', [])
-                    print(f"🔍 Debug - Number of topics: {len(topics) if topics else 0}")
-        except json.JSONDecodeError as e:
-            print(f"🔍 Debug - JSON parse error: {e}")
+                    self.logger.debug(lambda: f"Number of topics: {len(structured_json['data'][1].get('topics') or [])}")
+        except JSONUtils.DecodeError as e:
+            print(f"⚠️  Could not parse structured JSON response, using an empty report structure: {e}")
             # Return a minimal valid structure
             structured_json = {
                 "data": [
@@ -274,5 +326,17 @@ Themes and Topics:
         
         return {
             "structured_json": structured_json,
-            "usage": response.usage
-        } 
\ No newline at end of file
+            "usage": usage
+        }
+    
+    def _create_stream(self, messages: List[Dict[str, str]], **request_params):
+        """Start a streamed completion so the response is received while it is generated."""
+        return self.provider.client.chat.completions.create(
+            model=self.provider.config.model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=4000,  # Increased token limit
+            stream=True,
+            stream_options={"include_usage": True},
+            **request_params
+        )
@@ -60,6 +60,38 @@ Return a JSON object of the form {
   ]
 }
 
+Now here is the list of topics/subtopics:
+"""
+
+    COMMENTS_TO_CLAIMS_PROMPT = """
+I'm going to give you several comments made by participants, each with a comment id, and a list of topics and subtopics which have already been extracted.
+For each comment separately, I want you to extract a list of concise claims that its participant may support.
+We are only interested in claims that can be mapped to one of the given topic and subtopic.
+The claim must be fairly general but not a platitude.
+It must be something that other people may potentially disagree with. Each claim must also be atomic.
+For each claim, please also provide a relevant quote from the same comment.
+The quote must be as concise as possible while still supporting the argument.
+The quote doesn't need to be a logical argument.
+It could also be a personal story or anecdote illustrating why the interviewee would make this claim.
+You may use "[...]" in the quote to skip the less interesting bits of the quote.
+Return a JSON object with one result per comment, of the form {
+  "results": [
+    {
+      "commentIdx": number, // the comment id, e.g. 0 for commentIdx0
+      "claims": [
+        {
+          "claim": string, // a very concise extracted claim
+          "quote": string // the exact quote,
+          "topicName": string // from the given list of topics
+          "subtopicName": string // from the list of subtopics
+        },
+        // ...
+      ]
+    },
+    // ...
+  ]
+}
+
 Now here is the list of topics/subtopics:
 """
 
@@ -79,29 +111,78 @@ Return a JSON object of the form {
 }
 
 And now, here are the claims:
+"""
+
+    DEDUP_BATCH_PROMPT = """
+I'm going to give you several independent lists of claims. Each list has a subtopic id and each claim has an id.
+For each list separately, I want you to remove any near-duplicate claims from the list by nesting some claims under some top-level claims.
+For example, if a list has 5 claims and claim 3 and 5 are similar to claim 2, we will nest claim 3 and 5 under claim 2.
+Only compare claims within the same list. Claim ids are only unique within their own list.
+The nesting will be represented as a JSON object where the keys are the ids of the
+top-level claims and the values are lists of ids of the nested claims.
+
+Return a JSON object with one entry per subtopic id, of the form {
+  "subtopicId0": {
+    "nesting": {
+      "claimId1": [],
+      "claimId2": ["claimId3", "claimId5"],
+      "claimId4": []
+    }
+  },
+  "subtopicId1": {
+    "nesting": {
+      "claimId0": ["claimId1"]
+    }
+  }
+}
+
+And now, here are the lists of claims:
 """
 
     @classmethod
     def get_taxonomy_prompt(cls, comments: list) -> str:
         """Get the complete taxonomy prompt with comments."""
-        full_prompt = cls.COMMENT_TO_TREE_PROMPT
-        for comment in comments:
-            full_prompt += "\n" + comment
-        return full_prompt
+        return "\n".join([cls.COMMENT_TO_TREE_PROMPT, *comments])
     
-    @classmethod
-    def get_claims_prompt(cls, taxonomy: dict, comment: str) -> str:
-        """Get the complete claims prompt with taxonomy and comment."""
+    @staticmethod
+    def _taxonomy_string(taxonomy: dict) -> str:
+        """Serialize the taxonomy for a prompt as compact JSON (whitespace only costs input tokens)."""
         import json
-        full_prompt = cls.COMMENT_TO_CLAIMS_PROMPT
-        taxonomy_string = json.dumps(taxonomy, indent=1)
-        full_prompt += "\n" + taxonomy_string + "\nAnd then here is the comment:\n" + comment
-        return full_prompt
+        return json.dumps(taxonomy, separators=(",", ":"))
+    
+    @classmethod
+    def get_claims_prompt_prefix(cls, taxonomy: dict) -> str:
+        """Get the claims prompt up to the comment, with the taxonomy serialized."""
+        return cls.COMMENT_TO_CLAIMS_PROMPT + "\n" + cls._taxonomy_string(taxonomy) + "\nAnd then here is the comment:\n"
+    
+    @classmethod
+    def get_claims_prompt(cls, taxonomy: dict, comment: str, prefix: str = None) -> str:
+        """Get the complete claims prompt with taxonomy and comment.
+        
+        Pass a prefix from get_claims_prompt_prefix() to avoid re-serializing the taxonomy.
+        """
+        if prefix is None:
+            prefix = cls.get_claims_prompt_prefix(taxonomy)
+        return prefix + comment
+    
+    @classmethod
+    def get_claims_multi_prompt(cls, taxonomy: dict, comments: list) -> str:
+        """Get the claims prompt for several comments at once."""
+        return (
+            cls.COMMENTS_TO_CLAIMS_PROMPT + "\n" + cls._taxonomy_string(taxonomy) + "\nAnd then here are the comments:"
+            + "".join(f"\ncommentIdx{i}: {comment}" for i, comment in enumerate(comments))
+        )
     
     @classmethod
     def get_dedup_prompt(cls, claims: list) -> str:
         """Get the complete deduplication prompt with claims."""
-        full_prompt = cls.DEDUP_PROMPT
-        for i, claim in enumerate(claims):
-            full_prompt += "\nclaimId" + str(i) + ": " + claim
-        return full_prompt 
\ No newline at end of file
+        return cls.DEDUP_PROMPT + "".join(f"\nclaimId{i}: {claim}" for i, claim in enumerate(claims)) 
+    
+    @classmethod
+    def get_dedup_batch_prompt(cls, claims_lists: list) -> str:
+        """Get the deduplication prompt for several subtopics' claims at once."""
+        parts = [cls.DEDUP_BATCH_PROMPT]
+        for i, claims in enumerate(claims_lists):
+            parts.append(f"\n\nsubtopicId{i}:")
+            parts.extend(f"\nclaimId{j}: {claim}" for j, claim in enumerate(claims))
+        return "".join(parts)
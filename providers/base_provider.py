@@ -3,28 +3,53 @@ Base provider class for LLM providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, AsyncIterator
+from openai import AsyncOpenAI
 from openai.types import CompletionUsage
 
 from config import ProviderConfig
 from models.taxonomy import TaxonomyResponse
-from models.claims import ClaimsResponse, DeduplicationResponse
+from models.claims import ClaimsResponse, MultiClaimsResponse, DeduplicationResponse, DeduplicationBatchResponse
 
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
+    # Whether extract_claims_batch() uses an asynchronous provider Batch API
+    supports_batch_api = False
+    
     def __init__(self, config: ProviderConfig, api_key: str):
         """Initialize the provider with configuration and API key."""
         self.config = config
         self.api_key = api_key
         self.client = None
+        self.async_client = None
     
     @abstractmethod
     def initialize_client(self) -> None:
         """Initialize the LLM client."""
         pass
     
+    @abstractmethod
+    def create_async_client(self) -> AsyncOpenAI:
+        """Create an async LLM client for the running event loop."""
+        pass
+    
+    @asynccontextmanager
+    async def async_session(self) -> AsyncIterator['BaseLLMProvider']:
+        """Open an async client for the running event loop and close it on exit.
+        
+        Async clients hold connections bound to the loop that created them,
+        so each asyncio.run() opens its own session.
+        """
+        self.async_client = self.create_async_client()
+        try:
+            yield self
+        finally:
+            await self.async_client.close()
+            self.async_client = None
+    
     @abstractmethod
     def create_taxonomy(self, system_prompt: str, user_prompt: str) -> TaxonomyResponse:
         """Create taxonomy from comments."""
@@ -35,11 +60,38 @@ class BaseLLMProvider(ABC):
         """Extract claims from a comment."""
         pass
     
+    async def extract_claims_async(self, system_prompt: str, user_prompt: str) -> ClaimsResponse:
+        """Extract claims from a comment without blocking the event loop (requires async_session)."""
+        messages = self.create_messages(system_prompt, user_prompt)
+        
+        response = await self.async_client.chat.completions.create(
+            messages=messages,
+            **self.get_model_parameters()
+        )
+        
+        return ClaimsResponse.from_llm_content(response.choices[0].message.content, response.usage)
+    
+    @abstractmethod
+    def extract_claims_multi(self, system_prompt: str, user_prompt: str,
+                             num_comments: int) -> MultiClaimsResponse:
+        """Extract claims for several comments in one request."""
+        pass
+    
+    def extract_claims_batch(self, system_prompt: str, user_prompts: List[str]) -> List[ClaimsResponse]:
+        """Extract claims for several comments, returning responses in prompt order."""
+        return [self.extract_claims(system_prompt, user_prompt) for user_prompt in user_prompts]
+    
     @abstractmethod
     def deduplicate_claims(self, system_prompt: str, user_prompt: str) -> DeduplicationResponse:
         """Deduplicate claims."""
         pass
     
+    @abstractmethod
+    def deduplicate_claims_batch(self, system_prompt: str, user_prompt: str,
+                                 num_subtopics: int) -> DeduplicationBatchResponse:
+        """Deduplicate claims for several subtopics in one request."""
+        pass
+    
     def get_provider_info(self) -> Dict[str, Any]:
         """Get provider information."""
         return {
@@ -47,13 +99,16 @@ class BaseLLMProvider(ABC):
             "model": self.config.model,
             "base_url": self.config.base_url,
             "cost_in_per_10k": self.config.cost_in_per_10k,
-            "cost_out_per_10k": self.config.cost_out_per_10k
+            "cost_out_per_10k": self.config.cost_out_per_10k,
+            "batch_discount": self.config.batch_discount
         }
     
-    def calculate_cost(self, usage: CompletionUsage) -> float:
-        """Calculate cost based on token usage."""
-        input_cost = (usage.prompt_tokens * self.config.cost_in_per_10k) / 10000.0
-        output_cost = (usage.completion_tokens * self.config.cost_out_per_10k) / 10000.0
+    def calculate_cost(self, usage: CompletionUsage, batch: bool = False) -> float:
+        """Calculate cost based on token usage, at batch pricing when batch is set."""
+        input_cost = usage.prompt_tokens * self.config.cost_in_per_token
+        output_cost = usage.completion_tokens * self.config.cost_out_per_token
+        if batch:
+            return (input_cost + output_cost) * self.config.batch_discount
         return input_cost + output_cost
     
     def get_model_parameters(self) -> Dict[str, Any]:
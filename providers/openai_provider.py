@@ -2,19 +2,23 @@
 OpenAI provider implementation.
 """
 
-import json
-from openai import OpenAI
-from typing import Dict, Any
+import time
+from openai import OpenAI, AsyncOpenAI
+from openai.types import CompletionUsage
+from typing import Dict, Any, List
 
 from providers.base_provider import BaseLLMProvider
-from config import ProviderConfig
+from config import ProviderConfig, Config
 from models.taxonomy import TaxonomyResponse
-from models.claims import ClaimsResponse, DeduplicationResponse
+from models.claims import ClaimsResponse, MultiClaimsResponse, DeduplicationResponse, DeduplicationBatchResponse
+from utils.json_utils import JSONUtils
 
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI provider implementation."""
     
+    supports_batch_api = True
+    
     def __init__(self, config: ProviderConfig, api_key: str):
         """Initialize OpenAI provider."""
         super().__init__(config, api_key)
@@ -25,6 +29,10 @@ class OpenAIProvider(BaseLLMProvider):
         self.client = OpenAI(api_key=self.api_key)
         print(f"🔗 Connected to OpenAI")
     
+    def create_async_client(self) -> AsyncOpenAI:
+        """Create an async OpenAI client."""
+        return AsyncOpenAI(api_key=self.api_key)
+    
     def create_taxonomy(self, system_prompt: str, user_prompt: str) -> TaxonomyResponse:
         """Create taxonomy from comments using OpenAI."""
         messages = self.create_messages(system_prompt, user_prompt)
@@ -34,8 +42,7 @@ class OpenAIProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        taxonomy_dict = json.loads(response.choices[0].message.content)
-        return TaxonomyResponse.from_llm_response(taxonomy_dict, response.usage)
+        return TaxonomyResponse.from_llm_content(response.choices[0].message.content, response.usage)
     
     def extract_claims(self, system_prompt: str, user_prompt: str) -> ClaimsResponse:
         """Extract claims from a comment using OpenAI."""
@@ -46,8 +53,80 @@ class OpenAIProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        claims_dict = json.loads(response.choices[0].message.content)
-        return ClaimsResponse.from_llm_response(claims_dict, response.usage)
+        return ClaimsResponse.from_llm_content(response.choices[0].message.content, response.usage)
+    
+    def extract_claims_multi(self, system_prompt: str, user_prompt: str,
+                             num_comments: int) -> MultiClaimsResponse:
+        """Extract claims for several comments using OpenAI."""
+        messages = self.create_messages(system_prompt, user_prompt)
+        
+        response = self.client.chat.completions.create(
+            messages=messages,
+            **self.get_model_parameters()
+        )
+        
+        return MultiClaimsResponse.from_llm_content(
+            response.choices[0].message.content, response.usage, num_comments
+        )
+    
+    def extract_claims_batch(self, system_prompt: str, user_prompts: List[str]) -> List[ClaimsResponse]:
+        """Extract claims for several comments through the OpenAI Batch API."""
+        endpoint = "/v1/chat/completions"
+        model_parameters = self.get_model_parameters()
+        lines = [
+            JSONUtils.dumps({
+                "custom_id": f"comment_{i}",
+                "method": "POST",
+                "url": endpoint,
+                "body": {"messages": self.create_messages(system_prompt, user_prompt), **model_parameters}
+            })
+            for i, user_prompt in enumerate(user_prompts)
+        ]
+        
+        # Upload requests and create the batch
+        batch_file = self.client.files.create(
+            file=("claims_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=endpoint,
+            completion_window=Config.BATCH_COMPLETION_WINDOW
+        )
+        print(f"📦 Submitted batch {batch.id} with {len(user_prompts)} requests")
+        
+        # Poll until the batch reaches a terminal state
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(Config.BATCH_POLL_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} finished with status: {batch.status}")
+        
+        # Parse results back into prompt order using custom_id
+        responses: List[ClaimsResponse] = [None] * len(user_prompts)
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            result = JSONUtils.loads(line)
+            response = result.get("response")
+            if not response or response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            idx = int(result["custom_id"].removeprefix("comment_"))
+            responses[idx] = ClaimsResponse.from_llm_content(
+                body["choices"][0]["message"]["content"],
+                CompletionUsage.model_validate(body["usage"]),
+                batch_priced=True
+            )
+        
+        # Retry requests the batch did not complete one at a time
+        for idx, response in enumerate(responses):
+            if response is None:
+                print(f"⚠️  Batch request comment_{idx} failed, retrying individually")
+                responses[idx] = self.extract_claims(system_prompt, user_prompts[idx])
+        
+        return responses
     
     def deduplicate_claims(self, system_prompt: str, user_prompt: str) -> DeduplicationResponse:
         """Deduplicate claims using OpenAI."""
@@ -58,5 +137,18 @@ class OpenAIProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        dedup_dict = json.loads(response.choices[0].message.content)
-        return DeduplicationResponse.from_llm_response(dedup_dict, response.usage) 
\ No newline at end of file
+        return DeduplicationResponse.from_llm_content(response.choices[0].message.content, response.usage) 
+    
+    def deduplicate_claims_batch(self, system_prompt: str, user_prompt: str,
+                                 num_subtopics: int) -> DeduplicationBatchResponse:
+        """Deduplicate claims for several subtopics using OpenAI."""
+        messages = self.create_messages(system_prompt, user_prompt)
+        
+        response = self.client.chat.completions.create(
+            messages=messages,
+            **self.get_model_parameters()
+        )
+        
+        return DeduplicationBatchResponse.from_llm_content(
+            response.choices[0].message.content, response.usage, num_subtopics
+        )
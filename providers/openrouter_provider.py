@@ -2,14 +2,31 @@
 OpenRouter provider implementation.
 """
 
-import json
-from openai import OpenAI
-from typing import Dict, Any
+import hashlib
+from importlib.util import find_spec
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from typing import Dict, Any, Tuple
 
 from providers.base_provider import BaseLLMProvider
 from config import ProviderConfig, Config
 from models.taxonomy import TaxonomyResponse
-from models.claims import ClaimsResponse, DeduplicationResponse
+from models.claims import ClaimsResponse, MultiClaimsResponse, DeduplicationResponse, DeduplicationBatchResponse
+
+# Clients shared by all provider instances, keyed by (base_url, API key hash)
+_CLIENT_CACHE: Dict[Tuple[str, str], OpenAI] = {}
+
+# HTTP/2 lets concurrent requests share one connection; it needs the optional h2 package
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+def _http_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async OpenRouter clients."""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+    )
 
 
 class OpenRouterProvider(BaseLLMProvider):
@@ -21,13 +38,31 @@ class OpenRouterProvider(BaseLLMProvider):
         self.initialize_client()
     
     def initialize_client(self) -> None:
-        """Initialize OpenRouter client."""
-        self.client = OpenAI(
+        """Initialize OpenRouter client, reusing a pooled client for the same endpoint and key."""
+        cache_key = (self.config.base_url, hashlib.sha256(self.api_key.encode("utf-8")).hexdigest())
+        client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            client = OpenAI(
+                api_key=self.api_key,
+                base_url=self.config.base_url,
+                default_headers=Config.OPENROUTER_HEADERS,
+                http_client=DefaultHttpxClient(limits=_http_limits(), http2=_HTTP2_AVAILABLE)
+            )
+            _CLIENT_CACHE[cache_key] = client
+        self.client = client
+        print(f"🔗 Connected to OpenRouter with Gemini 2.0 Flash")
+    
+    def create_async_client(self) -> AsyncOpenAI:
+        """Create an async OpenRouter client with the same pooled (HTTP/2 when available) transport.
+        
+        Its connections are bound to the running event loop, so one is created per async session.
+        """
+        return AsyncOpenAI(
             api_key=self.api_key,
             base_url=self.config.base_url,
-            default_headers=Config.OPENROUTER_HEADERS
+            default_headers=Config.OPENROUTER_HEADERS,
+            http_client=DefaultAsyncHttpxClient(limits=_http_limits(), http2=_HTTP2_AVAILABLE)
         )
-        print(f"🔗 Connected to OpenRouter with Gemini 2.0 Flash")
     
     def create_taxonomy(self, system_prompt: str, user_prompt: str) -> TaxonomyResponse:
         """Create taxonomy from comments using OpenRouter."""
@@ -38,8 +73,7 @@ class OpenRouterProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        taxonomy_dict = json.loads(response.choices[0].message.content)
-        return TaxonomyResponse.from_llm_response(taxonomy_dict, response.usage)
+        return TaxonomyResponse.from_llm_content(response.choices[0].message.content, response.usage)
     
     def extract_claims(self, system_prompt: str, user_prompt: str) -> ClaimsResponse:
         """Extract claims from a comment using OpenRouter."""
@@ -50,8 +84,21 @@ class OpenRouterProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        claims_dict = json.loads(response.choices[0].message.content)
-        return ClaimsResponse.from_llm_response(claims_dict, response.usage)
+        return ClaimsResponse.from_llm_content(response.choices[0].message.content, response.usage)
+    
+    def extract_claims_multi(self, system_prompt: str, user_prompt: str,
+                             num_comments: int) -> MultiClaimsResponse:
+        """Extract claims for several comments using OpenRouter."""
+        messages = self.create_messages(system_prompt, user_prompt)
+        
+        response = self.client.chat.completions.create(
+            messages=messages,
+            **self.get_model_parameters()
+        )
+        
+        return MultiClaimsResponse.from_llm_content(
+            response.choices[0].message.content, response.usage, num_comments
+        )
     
     def deduplicate_claims(self, system_prompt: str, user_prompt: str) -> DeduplicationResponse:
         """Deduplicate claims using OpenRouter."""
@@ -62,5 +109,18 @@ class OpenRouterProvider(BaseLLMProvider):
             **self.get_model_parameters()
         )
         
-        dedup_dict = json.loads(response.choices[0].message.content)
-        return DeduplicationResponse.from_llm_response(dedup_dict, response.usage) 
\ No newline at end of file
+        return DeduplicationResponse.from_llm_content(response.choices[0].message.content, response.usage) 
+    
+    def deduplicate_claims_batch(self, system_prompt: str, user_prompt: str,
+                                 num_subtopics: int) -> DeduplicationBatchResponse:
+        """Deduplicate claims for several subtopics using OpenRouter."""
+        messages = self.create_messages(system_prompt, user_prompt)
+        
+        response = self.client.chat.completions.create(
+            messages=messages,
+            **self.get_model_parameters()
+        )
+        
+        return DeduplicationBatchResponse.from_llm_content(
+            response.choices[0].message.content, response.usage, num_subtopics
+        )
@@ -18,9 +18,16 @@ class ProviderFactory:
         'openrouter': OpenRouterProvider
     }
     
+    # Created providers, keyed by provider; each holds a client that is reused
+    _instances: Dict[str, BaseLLMProvider] = {}
+    
     @classmethod
     def create_provider(cls, provider_key: str) -> BaseLLMProvider:
-        """Create a provider instance based on the provider key."""
+        """Create a provider instance based on the provider key, reusing one already created."""
+        provider = cls._instances.get(provider_key)
+        if provider is not None:
+            return provider
+        
         if provider_key not in cls.PROVIDERS:
             raise ValueError(f"Unknown provider: {provider_key}. Available providers: {list(cls.PROVIDERS.keys())}")
         
@@ -32,7 +39,14 @@ class ProviderFactory:
         
         # Create provider instance
         provider_class = cls.PROVIDERS[provider_key]
-        return provider_class(provider_config, api_key)
+        provider = provider_class(provider_config, api_key)
+        cls._instances[provider_key] = provider
+        return provider
+    
+    @classmethod
+    def clear_instances(cls):
+        """Forget created providers so the next create_provider() picks up current API keys."""
+        cls._instances.clear()
     
     @classmethod
     def get_available_providers(cls) -> list:
@@ -0,0 +1,74 @@
+"""
+Persistent cache of Step 2 claims extractions for the T3C pipeline.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+from openai.types import CompletionUsage
+
+from config import Config
+from models.claims import ClaimsExtraction, ClaimsResponse
+from prompts.prompts import SystemPrompts
+from utils.json_utils import JSONUtils
+
+
+class ClaimsCache:
+    """Exact-match cache of extracted claims, scoped to one taxonomy, model, prompt set and batch size."""
+
+    def __init__(self, taxonomy_dict: Dict[str, Any], model: str, batch_size: int = 1,
+                 cache_dir: str = Config.CLAIMS_CACHE_DIR):
+        """Load cached claims for this taxonomy, model, prompts and batch size from disk."""
+        # Canonical serialization, so the namespace does not depend on orjson being installed
+        taxonomy_json = json.dumps(taxonomy_dict, sort_keys=True, separators=(",", ":"))
+        namespace = "\0".join((
+            model,
+            taxonomy_json,
+            SystemPrompts.SYSTEM_PROMPT,
+            SystemPrompts.COMMENT_TO_CLAIMS_PROMPT,
+            SystemPrompts.COMMENTS_TO_CLAIMS_PROMPT if batch_size > 1 else "",
+            str(batch_size)
+        ))
+        namespace_hash = hashlib.sha256(namespace.encode("utf-8")).hexdigest()
+        self.path = os.path.join(cache_dir, f"claims_{namespace_hash}.json")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.dirty = False
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as f:
+                    self.entries = JSONUtils.loads(f.read())
+            except (OSError, JSONUtils.DecodeError):
+                print(f"⚠️  Ignoring unreadable claims cache: {self.path}")
+
+    @staticmethod
+    def _key(comment: str) -> str:
+        """Get the cache key for a comment."""
+        return hashlib.sha256(comment.encode("utf-8")).hexdigest()
+
+    def get(self, comment: str) -> Optional[ClaimsResponse]:
+        """Get cached claims for a comment, reporting zero token usage."""
+        claims_dict = self.entries.get(self._key(comment))
+        if claims_dict is None:
+            return None
+        self.hits += 1
+        return ClaimsResponse(
+            claims_extraction=ClaimsExtraction.from_dict(claims_dict),
+            usage=CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        )
+
+    def put(self, comment: str, response: ClaimsResponse):
+        """Store the claims extracted from a comment."""
+        self.entries[self._key(comment)] = response.claims_extraction.to_dict()
+        self.dirty = True
+
+    def save(self):
+        """Write the cache to disk if it has new entries."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(JSONUtils.dumps_bytes(self.entries))
+        self.dirty = False
@@ -2,36 +2,74 @@
 Cost estimation utilities for the T3C pipeline.
 """
 
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from config import Config, ProviderConfig
+from prompts.prompts import SystemPrompts
+
+# Prompt lengths (in characters) used by the estimates
+_SYSTEM_PROMPT_LEN = len(SystemPrompts.SYSTEM_PROMPT)
+_TREE_PROMPT_LEN = len(SystemPrompts.COMMENT_TO_TREE_PROMPT)
+_CLAIMS_PROMPT_LEN = len(SystemPrompts.COMMENT_TO_CLAIMS_PROMPT)
+_DEDUP_PROMPT_LEN = len(SystemPrompts.DEDUP_PROMPT)
 
 
 class CostEstimator:
     """Utility for estimating pipeline costs."""
     
+    # Shared estimators, keyed by provider
+    _instances: Dict[str, 'CostEstimator'] = {}
+    
     def __init__(self, provider_config: ProviderConfig):
         """Initialize cost estimator with provider configuration."""
         self.provider_config = provider_config
         self.cost_in_per_10k = provider_config.cost_in_per_10k
         self.cost_out_per_10k = provider_config.cost_out_per_10k
+        self.cost_in_per_token = provider_config.cost_in_per_token
+        self.cost_out_per_token = provider_config.cost_out_per_token
+    
+    @classmethod
+    def for_provider(cls, provider_key: str) -> 'CostEstimator':
+        """Get the shared estimator for a provider."""
+        estimator = cls._instances.get(provider_key)
+        if estimator is None:
+            estimator = cls(Config.get_provider_config(provider_key))
+            cls._instances[provider_key] = estimator
+        return estimator
     
-    def estimate_total_cost(self, comments: List[str]) -> float:
-        """Estimate total cost for processing all comments."""
-        step1_cost = self.estimate_step1_cost(comments)
-        step2_cost = self.estimate_step2_cost(comments)
+    @staticmethod
+    def unique_comments(comments: List[str], comments_total: Optional[int] = None) -> Tuple[List[str], int]:
+        """Get the distinct comments (first occurrence order) and their character total."""
+        unique = list(dict.fromkeys(comments))
+        if comments_total is None or len(unique) < len(comments):
+            comments_total = sum(len(c) for c in unique)
+        return unique, comments_total
+    
+    def estimate_total_cost(self, comments: List[str], comments_total: Optional[int] = None,
+                            unique: Optional[Tuple[List[str], int]] = None) -> float:
+        """Estimate total cost for processing all comments.
+        
+        Pass unique (from unique_comments) to reuse an existing deduplication.
+        """
+        if comments_total is None:
+            comments_total = sum(len(c) for c in comments)
+        if unique is None:
+            unique = self.unique_comments(comments, comments_total)
+        
+        step1_cost = self.estimate_step1_cost(comments, comments_total)
+        step2_cost = self.estimate_step2_cost(*unique)
         step4_cost = self.estimate_step4_cost(comments)
         
         return step1_cost + step2_cost + step4_cost
     
-    def estimate_step1_cost(self, comments: List[str]) -> float:
+    def estimate_step1_cost(self, comments: List[str], comments_total: Optional[int] = None) -> float:
         """Estimate cost for Step 1: Comments to taxonomy."""
         # Calculate input tokens
-        comments_total = sum(len(c) for c in comments)
-        from prompts.prompts import SystemPrompts
+        if comments_total is None:
+            comments_total = sum(len(c) for c in comments)
         
         step1_tokens_in = (
-            len(SystemPrompts.SYSTEM_PROMPT) + 
-            len(SystemPrompts.COMMENT_TO_TREE_PROMPT) + 
+            _SYSTEM_PROMPT_LEN + 
+            _TREE_PROMPT_LEN + 
             comments_total
         ) / 4.0
         
@@ -39,56 +77,65 @@ class CostEstimator:
         step1_tokens_out = Config.AVG_TREE_LEN_TOKS
         
         # Calculate cost
-        cost_in = (step1_tokens_in * self.cost_in_per_10k) / 10000.0
-        cost_out = (step1_tokens_out * self.cost_out_per_10k) / 10000.0
+        cost_in = step1_tokens_in * self.cost_in_per_token
+        cost_out = step1_tokens_out * self.cost_out_per_token
         
         return cost_in + cost_out
     
-    def estimate_step2_cost(self, comments: List[str]) -> float:
-        """Estimate cost for Step 2: Comments to claims."""
+    def estimate_step2_cost(self, unique_comments: List[str], comments_total: Optional[int] = None) -> float:
+        """Estimate cost for Step 2: Comments to claims.
+        
+        Identical comments are extracted once, so pass the deduplicated list from unique_comments.
+        """
+        num_unique = len(unique_comments)
+        
         # Calculate input tokens
-        comments_total = sum(len(c) for c in comments)
-        from prompts.prompts import SystemPrompts
+        if comments_total is None:
+            comments_total = sum(len(c) for c in unique_comments)
         
         step2_tokens_in = (
             (comments_total / 4.0) + 
-            len(comments) * (
-                (len(SystemPrompts.SYSTEM_PROMPT) + len(SystemPrompts.COMMENT_TO_CLAIMS_PROMPT)) / 4.0 + 
+            num_unique * (
+                (_SYSTEM_PROMPT_LEN + _CLAIMS_PROMPT_LEN) / 4.0 + 
                 Config.AVG_TREE_LEN_TOKS
             )
         )
         
         # Output tokens (estimated)
-        step2_tokens_out = len(comments) * Config.AVG_CLAIM_TOKS_OUT
+        step2_tokens_out = num_unique * Config.AVG_CLAIM_TOKS_OUT
         
         # Calculate cost
-        cost_in = (step2_tokens_in * self.cost_in_per_10k) / 10000.0
-        cost_out = (step2_tokens_out * self.cost_out_per_10k) / 10000.0
+        cost_in = step2_tokens_in * self.cost_in_per_token
+        cost_out = step2_tokens_out * self.cost_out_per_token
         
         return cost_in + cost_out
     
     def estimate_step4_cost(self, comments: List[str]) -> float:
         """Estimate cost for Step 4: Deduplication."""
         # Calculate input tokens
-        from prompts.prompts import SystemPrompts
-        
         step4_tokens_in = (
-            (len(SystemPrompts.SYSTEM_PROMPT) + len(SystemPrompts.DEDUP_PROMPT)) / 4.0
+            (_SYSTEM_PROMPT_LEN + _DEDUP_PROMPT_LEN) / 4.0
         ) * (len(comments) ** 0.33) * Config.AVG_DEDUP_INPUT_TOK
         
         # Output tokens (estimated)
         step4_tokens_out = len(comments) * Config.AVG_DEDUPED_CLAIMS_FACTOR
         
         # Calculate cost
-        cost_in = (step4_tokens_in * self.cost_in_per_10k) / 10000.0
-        cost_out = (step4_tokens_out * self.cost_out_per_10k) / 10000.0
+        cost_in = step4_tokens_in * self.cost_in_per_token
+        cost_out = step4_tokens_out * self.cost_out_per_token
         
         return cost_in + cost_out
     
-    def get_cost_breakdown(self, comments: List[str]) -> dict:
+    def get_cost_breakdown(self, comments: List[str], comments_total: Optional[int] = None,
+                           unique: Optional[Tuple[List[str], int]] = None) -> dict:
         """Get detailed cost breakdown."""
-        step1_cost = self.estimate_step1_cost(comments)
-        step2_cost = self.estimate_step2_cost(comments)
+        if comments_total is None:
+            comments_total = sum(len(c) for c in comments)
+        if unique is None:
+            unique = self.unique_comments(comments, comments_total)
+        
+        step1_cost = self.estimate_step1_cost(comments, comments_total)
+        step2_cost = self.estimate_step2_cost(*unique)
         step4_cost = self.estimate_step4_cost(comments)
         total_cost = step1_cost + step2_cost + step4_cost
         
@@ -104,11 +151,13 @@ class CostEstimator:
     def compare_providers(self, comments: List[str]) -> dict:
         """Compare costs across all providers."""
         comparison = {}
+        comments_total = sum(len(c) for c in comments)
+        unique = CostEstimator.unique_comments(comments, comments_total)
         
         for provider_key in Config.PROVIDERS:
-            provider_config = Config.get_provider_config(provider_key)
-            estimator = CostEstimator(provider_config)
-            cost = estimator.estimate_total_cost(comments)
+            estimator = CostEstimator.for_provider(provider_key)
+            provider_config = estimator.provider_config
+            cost = estimator.estimate_total_cost(comments, comments_total, unique)
             comparison[provider_key] = {
                 "name": provider_config.name,
                 "cost": round(cost, 4),
@@ -2,10 +2,59 @@
 Data loading utilities for the T3C pipeline.
 """
 
+import numpy as np
 import pandas as pd
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import os
 
+from config import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+# Values pandas.read_csv treats as missing by default; the PyArrow reader uses the same
+# list so loaded comments do not depend on whether pyarrow is installed
+_CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+
+# Built-in test datasets (from the notebook)
+_PETS_TEST_DATA = (
+    "I love cats", "I really really love dogs", "I'm not sure about birds",
+    "Cats are my favorite", "Dogs are the best", "No seriously dogs are great",
+    "Birds I'm hesitant about", "Cats can be walked outside and they don't have to",
+    "Dogs need to be walked regularly, every day",
+    "Dogs can be trained to perform adorable moves on verbal command",
+    "Can cats be trained?", "Dogs and cats are both adorable and fluffy",
+    "Good pets are chill", "Cats are fantastic", "A goldfish is my top choice",
+    "Lizards are scary", "Kittens are my favorite when they have snake-like scales",
+    "Hairless cats are unique", "Flying lizards are majestic", "Kittens are so boring"
+)
+
+_SCIFI_TEST_DATA = (
+    "My favorite fantasy novel is Name of the Wind",
+    "Terra Ignota is the best scifi series of all time",
+    "Idk about Kim Stanley Robinson",
+    "Name of the Wind is predictable and hard to read",
+    "Some of Kim Stanley Robinson is boring",
+    "Terra Ignota gets slow in the middle and hard to follow",
+    "Ada Palmer is spectacular",
+    "Becky Chambers has fantastic aliens in her work",
+    "Ministry for the Future and Years of Rice and Salt are really comprehensive and compelling stories",
+    "Do we still talk about Lord of the Rings or Game of Thrones or is epic fantasy over",
+    "What about Ted Chiang he is so good",
+    "Greg Egan is really good at characters and plot and hard science",
+    "I never finished Accelerando",
+    "Ministry for the Future is about the climate transition",
+    "The climate crisis is a major theme in Ministry for the Future",
+    "Ministry for the Future is about climate"
+)
+
 
 class DataLoader:
     """Utility for loading comments from various sources."""
@@ -17,20 +66,81 @@ class DataLoader:
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
         
         try:
-            df = pd.read_csv(csv_path)
-            if comment_column not in df.columns:
-                raise ValueError(f"Column '{comment_column}' not found in CSV. Available columns: {list(df.columns)}")
-            
-            comments = df[comment_column].tolist()
-            
-            # Filter out non-string values
-            comments = [str(c) for c in comments if pd.notna(c) and str(c).strip()]
-            
+            comments = []
+            for batch in DataLoader.iter_csv_batches(csv_path, comment_column):
+                comments.extend(batch)
             return comments
             
         except Exception as e:
             raise RuntimeError(f"Error loading CSV file: {str(e)}")
     
+    @staticmethod
+    def load_from_csv_arrow(csv_path: str, comment_column: str = "comment") -> "pa.ChunkedArray":
+        """Load comments from a CSV file as an Arrow string array, without converting to Python strings."""
+        if pa is None:
+            raise ImportError("pyarrow is required to load comments as an Arrow array")
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        
+        try:
+            return pa.chunked_array(DataLoader._iter_csv_arrays(csv_path, comment_column), type=pa.string())
+            
+        except Exception as e:
+            raise RuntimeError(f"Error loading CSV file: {str(e)}")
+    
+    @staticmethod
+    def iter_csv_batches(csv_path: str, comment_column: str = "comment",
+                         chunksize: int = Config.CSV_CHUNK_ROWS) -> Iterator[List[str]]:
+        """Stream cleaned comments from a CSV file in batches, without loading the whole file.
+        
+        With PyArrow, batches follow its read blocks (Config.CSV_BLOCK_SIZE bytes);
+        the pandas fallback reads chunksize rows at a time.
+        """
+        if pa is not None:
+            for comments in DataLoader._iter_csv_arrays(csv_path, comment_column):
+                yield comments.to_pylist()
+            return
+        
+        try:
+            reader = pd.read_csv(csv_path, usecols=[comment_column], chunksize=chunksize)
+        except ValueError:
+            columns = list(pd.read_csv(csv_path, nrows=0).columns)
+            raise ValueError(f"Column '{comment_column}' not found in CSV. Available columns: {columns}") from None
+        
+        with reader:
+            for chunk in reader:
+                # Filter out missing and blank values, vectorized over the column
+                comments = chunk[comment_column].dropna().astype(str)
+                yield comments[comments.str.strip() != ""].tolist()
+    
+    @staticmethod
+    def _iter_csv_arrays(csv_path: str, comment_column: str) -> Iterator["pa.Array"]:
+        """Stream one CSV column with PyArrow as cleaned Arrow arrays, one per read block."""
+        convert_options = pacsv.ConvertOptions(
+            include_columns=[comment_column],
+            column_types={comment_column: pa.string()},
+            null_values=_CSV_NULL_VALUES,
+            strings_can_be_null=True
+        )
+        read_options = pacsv.ReadOptions(block_size=Config.CSV_BLOCK_SIZE)
+        # Free-text comments often contain quoted newlines, which can straddle read blocks
+        parse_options = pacsv.ParseOptions(newlines_in_values=True)
+        try:
+            reader = pacsv.open_csv(csv_path, read_options=read_options,
+                                    parse_options=parse_options, convert_options=convert_options)
+        except pa.ArrowKeyError:
+            columns = pacsv.open_csv(csv_path, read_options=read_options,
+                                     parse_options=parse_options).schema.names
+            raise ValueError(f"Column '{comment_column}' not found in CSV. Available columns: {columns}") from None
+        
+        for batch in reader:
+            # Drop missing and blank comments with one vectorized mask and filter;
+            # like the pandas path, kept comments are not stripped
+            comments = batch.column(0)
+            trimmed_length = pc.utf8_length(pc.utf8_trim_whitespace(comments))
+            mask = pc.and_(pc.is_valid(comments), pc.greater(trimmed_length, 0))
+            yield pc.filter(comments, mask)
+    
     @staticmethod
     def load_from_list(comments: List[str]) -> List[str]:
         """Load comments from a Python list."""
@@ -63,41 +173,12 @@ class DataLoader:
     @staticmethod
     def _get_pets_test_data() -> List[str]:
         """Get pets test data from the notebook."""
-        pets_data = [
-            "I love cats", "I really really love dogs", "I'm not sure about birds",
-            "Cats are my favorite", "Dogs are the best", "No seriously dogs are great",
-            "Birds I'm hesitant about", "Cats can be walked outside and they don't have to",
-            "Dogs need to be walked regularly, every day",
-            "Dogs can be trained to perform adorable moves on verbal command",
-            "Can cats be trained?", "Dogs and cats are both adorable and fluffy",
-            "Good pets are chill", "Cats are fantastic", "A goldfish is my top choice",
-            "Lizards are scary", "Kittens are my favorite when they have snake-like scales",
-            "Hairless cats are unique", "Flying lizards are majestic", "Kittens are so boring"
-        ]
-        return pets_data
+        return list(_PETS_TEST_DATA)
     
     @staticmethod
     def _get_scifi_test_data() -> List[str]:
         """Get sci-fi test data from the notebook."""
-        scifi_data = [
-            "My favorite fantasy novel is Name of the Wind",
-            "Terra Ignota is the best scifi series of all time",
-            "Idk about Kim Stanley Robinson",
-            "Name of the Wind is predictable and hard to read",
-            "Some of Kim Stanley Robinson is boring",
-            "Terra Ignota gets slow in the middle and hard to follow",
-            "Ada Palmer is spectacular",
-            "Becky Chambers has fantastic aliens in her work",
-            "Ministry for the Future and Years of Rice and Salt are really comprehensive and compelling stories",
-            "Do we still talk about Lord of the Rings or Game of Thrones or is epic fantasy over",
-            "What about Ted Chiang he is so good",
-            "Greg Egan is really good at characters and plot and hard science",
-            "I never finished Accelerando",
-            "Ministry for the Future is about the climate transition",
-            "The climate crisis is a major theme in Ministry for the Future",
-            "Ministry for the Future is about climate"
-        ]
-        return scifi_data
+        return list(_SCIFI_TEST_DATA)
     
     @staticmethod
     def validate_comments(comments: List[str]) -> tuple:
@@ -107,17 +188,11 @@ class DataLoader:
         
         original_count = len(comments)
         
-        # Clean and validate
-        cleaned_comments = []
-        for i, comment in enumerate(comments):
-            if not isinstance(comment, str):
-                continue
-            
-            comment = comment.strip()
-            if not comment:
-                continue
-            
-            cleaned_comments.append(comment)
+        # Clean and validate: keep non-blank strings, stripped
+        cleaned_comments = [
+            stripped for stripped in (comment.strip() for comment in comments if isinstance(comment, str))
+            if stripped
+        ]
         
         final_count = len(cleaned_comments)
         
@@ -132,14 +207,16 @@ class DataLoader:
         if not comments:
             return {"count": 0, "total_chars": 0, "avg_length": 0, "lengths": []}
         
-        lengths = [len(c) for c in comments]
-        total_chars = sum(lengths)
+        # One pass to collect lengths into a contiguous buffer, then vectorized reductions
+        count = len(comments)
+        lengths = np.fromiter(map(len, comments), dtype=np.int64, count=count)
+        total_chars = int(lengths.sum())
         
         return {
-            "count": len(comments),
+            "count": count,
             "total_chars": total_chars,
-            "avg_length": total_chars / len(comments) if comments else 0,
-            "min_length": min(lengths) if lengths else 0,
-            "max_length": max(lengths) if lengths else 0,
-            "lengths": lengths
+            "avg_length": total_chars / count,
+            "min_length": int(lengths.min()),
+            "max_length": int(lengths.max()),
+            "lengths": lengths.tolist()
         } 
\ No newline at end of file
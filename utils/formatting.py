@@ -3,21 +3,28 @@ Formatting utilities for the T3C pipeline.
 """
 
 import json
-from typing import Any, Dict, List
-import wandb
+from operator import itemgetter
+from typing import Any, Dict, List, TYPE_CHECKING
+
+from utils.json_utils import JSONUtils
+
+if TYPE_CHECKING:
+    import wandb
 
 
 class Formatter:
     """Utility for formatting output and reports."""
     
     @staticmethod
-    def cute_print(json_obj: Any) -> wandb.Html:
+    def cute_print(json_obj: Any) -> "wandb.Html":
         """Return a pretty version of a dictionary as properly-indented JSON in HTML for W&B."""
+        import wandb
+        
         if not isinstance(json_obj, (dict, list)):
             json_obj = str(json_obj)
         
         try:
-            str_json = json.dumps(json_obj, indent=2)
+            str_json = JSONUtils.dumps(json_obj, indent=True)
         except (TypeError, ValueError):
             str_json = str(json_obj)
         
@@ -27,54 +34,59 @@ class Formatter:
     @staticmethod
     def format_cost_summary(cost_summary: Dict[str, Any]) -> str:
         """Format cost summary for console output."""
-        output = []
-        output.append(f"💰 COST SUMMARY for {cost_summary.get('provider_name', 'Unknown')}:")
-        output.append(f"   Estimated: ${cost_summary.get('estimated_cost', 0):.4f}")
-        output.append(f"   Actual: ${cost_summary.get('actual_cost', 0):.4f}")
-        output.append(f"   Token-based: ${cost_summary.get('token_based_cost', 0):.4f}")
-        output.append(f"   Accuracy: {cost_summary.get('accuracy_percentage', 0):.1f}% of estimate")
-        
-        return "\n".join(output)
+        get = cost_summary.get
+        return (
+            f"💰 COST SUMMARY for {get('provider_name', 'Unknown')}:\n"
+            f"   Estimated: ${get('estimated_cost', 0):.4f}\n"
+            f"   Actual: ${get('actual_cost', 0):.4f}\n"
+            f"   Token-based: ${get('token_based_cost', 0):.4f}\n"
+            f"   Accuracy: {get('accuracy_percentage', 0):.1f}% of estimate"
+        )
     
     @staticmethod
     def format_pipeline_summary(stats: Dict[str, Any]) -> str:
         """Format pipeline statistics for console output."""
-        output = []
-        output.append("📊 PIPELINE SUMMARY:")
-        output.append(f"   Provider: {stats.get('provider', 'Unknown')}")
-        output.append(f"   Model: {stats.get('model', 'Unknown')}")
-        output.append(f"   Comments processed: {stats.get('comments_processed', 0)}")
-        output.append(f"   Themes identified: {stats.get('themes_identified', 0)}")
-        output.append(f"   Topics identified: {stats.get('topics_identified', 0)}")
-        output.append(f"   Claims extracted: {stats.get('claims_extracted', 0)}")
-        output.append(f"   Duplicate groups: {stats.get('duplicate_groups', 0)}")
-        output.append(f"   Total tokens used: {stats.get('total_tokens_used', 0):,}")
-        
-        return "\n".join(output)
+        get = stats.get
+        return (
+            "📊 PIPELINE SUMMARY:\n"
+            f"   Provider: {get('provider', 'Unknown')}\n"
+            f"   Model: {get('model', 'Unknown')}\n"
+            f"   Comments processed: {get('comments_processed', 0)}\n"
+            f"   Themes identified: {get('themes_identified', 0)}\n"
+            f"   Topics identified: {get('topics_identified', 0)}\n"
+            f"   Claims extracted: {get('claims_extracted', 0)}\n"
+            f"   Duplicate groups: {get('duplicate_groups', 0)}\n"
+            f"   Total tokens used: {get('total_tokens_used', 0):,}"
+        )
     
     @staticmethod
     def format_provider_comparison(comparison: Dict[str, Any]) -> str:
         """Format provider cost comparison for console output."""
-        output = []
-        output.append("💰 PROVIDER COST COMPARISON:")
-        
-        # Sort by cost
-        sorted_providers = sorted(comparison.items(), key=lambda x: x[1]['cost'])
-        
-        for provider_key, info in sorted_providers:
-            output.append(f"   {info['name']}: ${info['cost']:.4f} ({info['model']})")
-        
-        if len(sorted_providers) > 1:
-            cheapest = sorted_providers[0][1]
-            most_expensive = sorted_providers[-1][1]
-            savings = most_expensive['cost'] - cheapest['cost']
-            percentage = (savings / most_expensive['cost']) * 100
-            
-            output.append("")
-            output.append(f"   💡 Cheapest: {cheapest['name']} - ${cheapest['cost']:.4f}")
-            output.append(f"   💰 Savings vs most expensive: ${savings:.4f} ({percentage:.1f}%)")
-        
-        return "\n".join(output)
+        # Sort by cost (nothing to sort or compare with a single provider)
+        if len(comparison) <= 1:
+            sorted_providers = list(comparison.values())
+        else:
+            sorted_providers = sorted(comparison.values(), key=itemgetter('cost'))
+        
+        provider_lines = "".join(
+            f"\n   {info['name']}: ${info['cost']:.4f} ({info['model']})"
+            for info in sorted_providers
+        )
+        
+        if len(sorted_providers) <= 1:
+            return f"💰 PROVIDER COST COMPARISON:{provider_lines}"
+        
+        cheapest = sorted_providers[0]
+        most_expensive = sorted_providers[-1]
+        savings = most_expensive['cost'] - cheapest['cost']
+        percentage = (savings / most_expensive['cost']) * 100
+        
+        return (
+            f"💰 PROVIDER COST COMPARISON:{provider_lines}\n"
+            "\n"
+            f"   💡 Cheapest: {cheapest['name']} - ${cheapest['cost']:.4f}\n"
+            f"   💰 Savings vs most expensive: ${savings:.4f} ({percentage:.1f}%)"
+        )
     
     @staticmethod
     def format_step_progress(step_num: int, step_name: str, provider_name: str) -> str:
@@ -84,18 +96,11 @@ class Formatter:
     @staticmethod
     def format_step_completion(step_num: int, stats: Dict[str, Any]) -> str:
         """Format step completion message."""
-        output = [f"✅ Step {step_num} completed!"]
+        cost_line = f"\n💰 Step {step_num} cost: ${stats['cost']:.4f}" if 'cost' in stats else ""
+        tokens_line = f"\n🔢 Token usage: {stats['tokens']} total" if 'tokens' in stats else ""
+        items_line = f"\n📊 Items processed: {stats['items_processed']}" if 'items_processed' in stats else ""
         
-        if 'cost' in stats:
-            output.append(f"💰 Step {step_num} cost: ${stats['cost']:.4f}")
-        
-        if 'tokens' in stats:
-            output.append(f"🔢 Token usage: {stats['tokens']} total")
-        
-        if 'items_processed' in stats:
-            output.append(f"📊 Items processed: {stats['items_processed']}")
-        
-        return "\n".join(output)
+        return f"✅ Step {step_num} completed!{cost_line}{tokens_line}{items_line}"
     
     @staticmethod
     def format_taxonomy_tree(taxonomy_dict: Dict[str, Any]) -> str:
@@ -114,8 +119,9 @@ class Formatter:
     @staticmethod
     def format_claims_summary(comment: str, num_claims: int, max_length: int = 50) -> str:
         """Format claims extraction summary."""
-        truncated_comment = comment[:max_length] + "..." if len(comment) > max_length else comment
-        return f"   📝 Comment: {truncated_comment}\n   🎯 Claims extracted: {num_claims}"
+        # Slicing is safe for short comments, so only the suffix depends on the length
+        suffix = "..." if len(comment) > max_length else ""
+        return f"   📝 Comment: {comment[:max_length]}{suffix}\n   🎯 Claims extracted: {num_claims}"
     
     @staticmethod
     def format_duplicate_summary(duplicate_groups: Dict[str, List[str]]) -> str:
@@ -142,6 +148,8 @@ class Formatter:
     def format_json_pretty(data: Any, indent: int = 2) -> str:
         """Format JSON data with pretty printing."""
         try:
+            if indent == 2:
+                return JSONUtils.dumps(data, indent=True)
             return json.dumps(data, indent=indent, ensure_ascii=False)
         except (TypeError, ValueError):
             return str(data) 
\ No newline at end of file
@@ -2,34 +2,50 @@
 JSON Schema loader and structured output utilities for T3C pipeline.
 """
 
-import json
-import os
-from typing import Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.json_utils import JSONUtils
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+# Directory holding the bundled JSON schemas
+_SCHEMA_DIR = Path(__file__).resolve().parent.parent / 'schemas'
 
 
 class JSONSchemaLoader:
     """Utility for loading JSON schemas and handling structured outputs."""
     
     @staticmethod
+    @lru_cache(maxsize=32)
     def load_schema(schema_name: str) -> Dict[str, Any]:
-        """Load a JSON schema from the schemas directory."""
-        schema_path = os.path.join(os.path.dirname(__file__), '..', 'schemas', f'{schema_name}.json')
-        
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
-        
-        return schema
+        """Load a JSON schema from the schemas directory (cached; do not mutate the result)."""
+        return JSONUtils.loads((_SCHEMA_DIR / f'{schema_name}.json').read_bytes())
     
     @staticmethod
-    def create_structured_response_format(schema_name: str) -> Dict[str, Any]:
-        """Create a structured response format for OpenRouter."""
+    @lru_cache(maxsize=16)
+    def get_validator(schema_name: str) -> Optional[Any]:
+        """Get a compiled validator for a schema, shared across callers (None without jsonschema)."""
+        if jsonschema is None:
+            return None
+        schema = JSONSchemaLoader.load_schema(schema_name)
+        return jsonschema.Draft7Validator(schema, format_checker=jsonschema.FormatChecker())
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def create_structured_response_format(schema_name: str, strict: bool = True) -> Dict[str, Any]:
+        """Create a structured response format for OpenRouter (cached; do not mutate the result)."""
         schema = JSONSchemaLoader.load_schema(schema_name)
         
         return {
             "type": "json_schema",
             "json_schema": {
                 "name": schema_name,
-                "strict": True,
+                "strict": strict,
                 "schema": schema
             }
         }
@@ -40,6 +56,11 @@ class JSONSchemaLoader:
         return JSONSchemaLoader.load_schema("t3c_output_schema")
     
     @staticmethod
-    def get_t3c_response_format() -> Dict[str, Any]:
+    def get_t3c_response_format(strict: bool = True) -> Dict[str, Any]:
         """Get the T3C response format for structured outputs."""
-        return JSONSchemaLoader.create_structured_response_format("t3c_output_schema") 
\ No newline at end of file
+        return JSONSchemaLoader.create_structured_response_format("t3c_output_schema", strict)
+    
+    @staticmethod
+    def get_t3c_validator() -> Optional[Any]:
+        """Get the compiled validator for the T3C output schema."""
+        return JSONSchemaLoader.get_validator("t3c_output_schema")
@@ -0,0 +1,43 @@
+"""
+JSON serialization utilities for the T3C pipeline.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONUtils:
+    """Utility for fast JSON encoding and decoding."""
+
+    # Raised by loads() on malformed input (orjson's error subclasses this)
+    DecodeError = json.JSONDecodeError
+
+    @staticmethod
+    def dumps_bytes(data: Any, indent: bool = False) -> bytes:
+        """Serialize data to UTF-8 encoded JSON bytes."""
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(data, option=option)
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def dumps(data: Any, indent: bool = False) -> str:
+        """Serialize data to a JSON string."""
+        if orjson is not None:
+            return JSONUtils.dumps_bytes(data, indent).decode("utf-8")
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse a JSON string or bytes."""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
@@ -2,9 +2,12 @@
 Logging utilities for W&B and Weave integration.
 """
 
+import queue
+import random
+import threading
 import wandb
 import weave
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Union
 from datetime import datetime
 import pytz
 from pytz import timezone
@@ -13,6 +16,15 @@ from config import Config, RuntimeConfig
 from models.report import T3CReport
 from utils.formatting import Formatter
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+_PACIFIC_TZ = timezone('US/Pacific')
+_DATE_FORMAT = '%m/%d/%Y %H:%M:%S'
+
 
 class Logger:
     """Utility for logging to W&B and Weave."""
@@ -22,6 +34,10 @@ class Logger:
         self.runtime_config = runtime_config
         self.initialized = False
         self.wandb_run = None
+        
+        # W&B payloads are sent by a background thread so logging never blocks the pipeline
+        self._log_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._log_worker: Optional[threading.Thread] = None
     
     def initialize(self, run_name: str, cost_estimate: float):
         """Initialize W&B and Weave logging."""
@@ -47,22 +63,66 @@ class Logger:
                     config=run_config
                 )
                 print("✅ W&B initialized")
+                
+                self._log_worker = threading.Thread(target=self._drain_log_queue, daemon=True)
+                self._log_worker.start()
             except Exception as e:
                 print(f"⚠️ W&B initialization failed: {e}")
         
         self.initialized = True
     
-    def log_comment_stats(self, comments: List[str]):
-        """Log comment statistics."""
+    def _drain_log_queue(self):
+        """Send queued payloads to W&B until the stop sentinel (None) arrives."""
+        while True:
+            payload = self._log_queue.get()
+            try:
+                if payload is None:
+                    return
+                wandb.log(payload)
+            except Exception as e:
+                print(f"⚠️ Failed to log to W&B: {e}")
+            finally:
+                self._log_queue.task_done()
+    
+    def _log(self, payload: Dict[str, Any]):
+        """Queue a payload for W&B; tables and HTML must already be built on the caller's thread."""
+        self._log_queue.put(payload)
+    
+    def _sample_rows(self, rows: List[List[Any]]) -> List[List[Any]]:
+        """Keep a random log_sample_rate fraction of table rows, before they are formatted."""
+        rate = self.runtime_config.log_sample_rate
+        if rate >= 1.0:
+            return rows
+        return [row for row in rows if random.random() < rate]
+    
+    def debug(self, message: Callable[[], str]):
+        """Print a debug message, built lazily so it costs nothing outside debug mode."""
+        if self.runtime_config.debug_mode:
+            print(f"🔍 Debug - {message()}")
+    
+    @property
+    def needs_legacy_format(self) -> bool:
+        """Whether the sorting step's legacy taxonomy format will be logged."""
+        return bool(self.runtime_config.enable_wandb and self.wandb_run)
+    
+    def log_comment_stats(self, comments: Union[List[str], "pa.Array", "pa.ChunkedArray"]):
+        """Log comment statistics from a list of comments or an Arrow string array."""
         if not self.runtime_config.enable_wandb or not self.wandb_run:
             return
         
-        comment_lengths = [len(c) for c in comments]
-        
         try:
-            wandb.log({
+            if pa is not None and isinstance(comments, (pa.Array, pa.ChunkedArray)):
+                # Vectorized lengths, without materializing the comments as Python strings
+                lengths = pc.utf8_length(comments)
+                text_len = pc.sum(lengths).as_py() or 0
+                comment_lengths = lengths.to_pylist()
+            else:
+                comment_lengths = [len(c) for c in comments]
+                text_len = sum(comment_lengths)
+            
+            self._log({
                 "comm_N": len(comments),
-                "comm_text_len": sum(comment_lengths),
+                "comm_text_len": text_len,
                 "comm_bins": comment_lengths
             })
         except Exception as e:
@@ -76,7 +136,11 @@ class Logger:
         
         try:
             # Create formatted taxonomy for display
-            comment_list = "\n".join(comments) if comments else "none"
+            # Only a preview of the comments goes into the table cell
+            preview_size = Config.LOG_COMMENT_PREVIEW
+            comment_list = "\n".join(comments[:preview_size]) if comments else "none"
+            if len(comments) > preview_size:
+                comment_list += f"\n... ({len(comments) - preview_size} more)"
             taxonomy_html = Formatter.cute_print(taxonomy_dict)
             
             table_data = [[
@@ -86,11 +150,12 @@ class Logger:
             ]]
             
             # Calculate metrics
-            num_themes = len(taxonomy_dict.get("taxonomy", []))
-            subtopics = [len(t.get("subtopics", [])) for t in taxonomy_dict.get("taxonomy", [])]
+            topics = taxonomy_dict.get("taxonomy", [])
+            num_themes = len(topics)
+            subtopics = [len(t.get("subtopics", [])) for t in topics]
             num_topics = sum(subtopics)
             
-            wandb.log({
+            self._log({
                 "u/1/N_tok": usage_stats.get("total_tokens", 0),
                 "u/1/in_tok": usage_stats.get("input_tokens", 0),
                 "u/1/out_tok": usage_stats.get("output_tokens", 0),
@@ -113,7 +178,7 @@ class Logger:
             return
         
         try:
-            wandb.log({
+            self._log({
                 "u/2/s_N_tok": usage_stats.get("total_tokens", 0),
                 "u/2/s_in_tok": usage_stats.get("input_tokens", 0),
                 "u/2/s_out_tok": usage_stats.get("output_tokens", 0),
@@ -125,15 +190,19 @@ class Logger:
             print(f"⚠️ Failed to log claims step: {e}")
     
     def log_claims_summary(self, all_claims_data: List[List[Any]], cost: float):
-        """Log claims extraction summary."""
+        """Log claims extraction summary from [comment, claims_dict] rows."""
         if not self.runtime_config.enable_wandb or not self.wandb_run:
             return
         
         try:
-            wandb.log({
+            table_data = [
+                [comment, Formatter.cute_print(claims_dict), Formatter.format_json_pretty(claims_dict)]
+                for comment, claims_dict in self._sample_rows(all_claims_data)
+            ]
+            self._log({
                 "u/2/cost": cost,
                 "row_to_claims": wandb.Table(
-                    data=all_claims_data,
+                    data=table_data,
                     columns=["comments", "claims", "raw_llm_out"]
                 )
             })
@@ -151,7 +220,7 @@ class Logger:
                 Formatter.format_json_pretty(sorted_taxonomy)
             ]]
             
-            wandb.log({
+            self._log({
                 "sort_tree": wandb.Table(
                     data=html_data,
                     columns=["sorted_taxonomy", "raw_llm_output"]
@@ -166,7 +235,7 @@ class Logger:
             return
         
         try:
-            wandb.log({
+            self._log({
                 "u/4/s_N_tok": usage_stats.get("total_tokens", 0),
                 "u/4/s_in_tok": usage_stats.get("input_tokens", 0),
                 "u/4/s_out_tok": usage_stats.get("output_tokens", 0),
@@ -179,15 +248,19 @@ class Logger:
     
     def log_deduplication_summary(self, dedup_data: List[List[Any]], cost: float, 
                                  num_claims: int, num_topics: int):
-        """Log deduplication summary."""
+        """Log deduplication summary from [claims_text, dedup_dict] rows."""
         if not self.runtime_config.enable_wandb or not self.wandb_run:
             return
         
         try:
-            wandb.log({
+            table_data = [
+                [claims_text, Formatter.cute_print(dedup_dict), Formatter.format_json_pretty(dedup_dict)]
+                for claims_text, dedup_dict in self._sample_rows(dedup_data)
+            ]
+            self._log({
                 "u/4/cost": cost,
                 "dedup_subclaims": wandb.Table(
-                    data=dedup_data,
+                    data=table_data,
                     columns=["sub_claim_list", "deduped_claims", "raw_llm_output"]
                 ),
                 "num_claims": num_claims,
@@ -202,19 +275,21 @@ class Logger:
             return
         
         try:
-            # Create formatted report for display
+            # Create formatted report for display (serialize the report once)
+            report_dict = report.to_dict()
             html_data = [[
-                Formatter.cute_print(report.to_dict()),
-                Formatter.format_json_pretty(report.to_dict())
+                Formatter.cute_print(report_dict),
+                Formatter.format_json_pretty(report_dict)
             ]]
             
             # Log comprehensive metrics
-            wandb.log({
+            step_costs_by_name = report.cost_summary.step_costs_by_name
+            self._log({
                 "cost/tok_total": report.cost_summary.token_based_cost,
                 "cost/actual": report.cost_summary.actual_cost,
-                "cost/1": next((step.cost for step in report.cost_summary.step_costs if step.step_name == "taxonomy"), 0),
-                "cost/2": next((step.cost for step in report.cost_summary.step_costs if step.step_name == "claims"), 0),
-                "cost/4": next((step.cost for step in report.cost_summary.step_costs if step.step_name == "deduplication"), 0),
+                "cost/1": step_costs_by_name.get("taxonomy", 0),
+                "cost/2": step_costs_by_name.get("claims", 0),
+                "cost/4": step_costs_by_name.get("deduplication", 0),
                 "csv_log": report.to_csv_log(self.runtime_config.exp_group),
                 "provider_used": report.cost_summary.provider_name,
                 "model_used": report.cost_summary.model_name,
@@ -232,7 +307,7 @@ class Logger:
             return
         
         try:
-            wandb.log({
+            self._log({
                 "u/N/N_tok": total_stats.get("total_tokens", 0),
                 "u/N/in_tok": total_stats.get("input_tokens", 0),
                 "u/N/out_tok": total_stats.get("output_tokens", 0),
@@ -242,18 +317,23 @@ class Logger:
             print(f"⚠️ Failed to log cumulative stats: {e}")
     
     def finish(self):
-        """Finish logging session."""
+        """Finish logging session, flushing any queued payloads. Safe to call twice."""
         if self.wandb_run:
+            if self._log_worker is not None:
+                # Flush queued payloads before closing the run
+                self._log_queue.put(None)
+                self._log_queue.join()
+                self._log_worker = None
             try:
                 self.wandb_run.finish()
                 print("✅ W&B session finished")
             except Exception as e:
                 print(f"⚠️ Failed to finish W&B session: {e}")
+            finally:
+                # Make repeated calls (e.g. from main's finally) a no-op
+                self.wandb_run = None
     
     @staticmethod
     def time_here() -> str:
         """Get current time in Pacific timezone."""
-        date_format = '%m/%d/%Y %H:%M:%S'
-        date = datetime.now()
-        date = date.astimezone(timezone('US/Pacific'))
-        return date.strftime(date_format) 
\ No newline at end of file
+        return datetime.now(_PACIFIC_TZ).strftime(_DATE_FORMAT)
\ No newline at end of file